@@ -0,0 +1,38 @@
+import pathlib
+import tracemalloc
+from xmlapigen.schema import Schema
+
+
+def build(schema):
+  cache = schema.get_cache()
+  for group in cache.get_groups().values():
+    group.get_groups()
+    for elem in group.get_elements().values():
+      elem.get_attributes()
+      elem.is_placeholder()
+  for node_type in cache.get_types().values():
+    node_type.get_groups()
+    for attr in node_type.get_attributes().values():
+      if not attr.is_any_attribute():
+        attr.is_any_type()
+        attr.get_enum_values()
+    for elem in node_type.get_elements().values():
+      elem.get_attributes()
+      elem.is_placeholder()
+
+
+if __name__ == '__main__':
+  here = str(pathlib.Path(__file__).parent.parent)
+  data_dir = here + '/test/_data/'
+
+  for xsd in ['compound.xsd', 'index.xsd']:
+    schema = Schema(data_dir + xsd)
+
+    # Only measure the wrappers, not xmlschema's own parsing.
+    tracemalloc.start()
+    schema.compile()
+    build(schema)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'{xsd}: {current / 1024:.1f} KiB retained, {peak / 1024:.1f} KiB peak')
@@ -0,0 +1,98 @@
+import json
+import pathlib
+import shutil
+from xmlapigen.config_generator import ConfigGenerator
+from xmlapigen.element_generator import ElementGenerator, MANIFEST, FILES
+
+
+class RecordingGenerator(ElementGenerator):
+  """Element generator remembering what it rendered, which can be made to
+  fail half way through a run.
+  """
+
+  def __init__(self, *args, fail=False, **kwargs):
+    super().__init__(*args, incremental=True, **kwargs)
+    self.rendered = []
+    self._fail = fail
+
+  def _render(self, config, jobs):
+    self.rendered += [job[1] for job in jobs]
+    if self._fail:
+      raise Exception('Interrupted')
+
+    return super()._render(config, jobs)
+
+
+def generate(output_dir, fail=False):
+  generator = RecordingGenerator(
+    output_dir,
+    output_dir + '/config.yml',
+    fail=fail
+  )
+  generator.generate()
+
+  return generator.rendered
+
+
+def replace(path, old, new):
+  content = path.read_text()
+  assert old in content, f'{old} not found in {path}'
+  path.write_text(content.replace(old, new))
+
+
+if __name__ == '__main__':
+  here = pathlib.Path(__file__).parent.parent
+  output = '_build_incremental'
+  output_dir = str(here / output)
+  xsd_dir = here / output / 'xsd' / 'compound'
+  group = xsd_dir / 'groups' / 'doc_cmd_group.py'
+  config_file = here / output / 'config.yml'
+  manifest_file = xsd_dir / MANIFEST
+
+  shutil.rmtree(output_dir, ignore_errors=True)
+  ConfigGenerator(output, [str(here / 'test/_data/compound.xsd')]).generate()
+
+  try:
+    # A first run renders everything
+    assert len(generate(output_dir)) > 0
+    assert "@Element('verbatim', str)" in group.read_text()
+
+    # Unchanged classes are not rendered again
+    assert generate(output_dir) == []
+
+    # Changed classes are
+    replace(config_file, 'verbatim: str', 'verbatim: int')
+    assert generate(output_dir) == ['docCmdGroup']
+    assert "@Element('verbatim', int)" in group.read_text()
+
+    # As are the classes collecting enum values whose plural changed
+    doxygen = xsd_dir / 'types' / 'doxygen_type.py'
+    replace(config_file, 'C#: C#S', 'C#: csharps')
+    assert generate(output_dir) == ['DoxygenType']
+    assert "'csharps': 'C#'" in doxygen.read_text()
+
+    # Files which are no longer generated are removed
+    stale = xsd_dir / 'groups' / 'stale_group.py'
+    stale.write_text('')
+    manifest = json.loads(manifest_file.read_text())
+    manifest[FILES]['groups/stale_group.py'] = 'stale'
+    manifest_file.write_text(json.dumps(manifest))
+    assert generate(output_dir) == []
+    assert not stale.exists()
+    assert 'groups/stale_group.py' not in json.loads(manifest_file.read_text())[FILES]
+
+    # An interrupted run does not mark its classes up to date
+    replace(config_file, 'verbatim: int', 'verbatim: str')
+    try:
+      generate(output_dir, fail=True)
+      raise AssertionError('The run was not interrupted')
+    except Exception as e:
+      if str(e) != 'Interrupted':
+        raise
+    assert "@Element('verbatim', int)" in group.read_text()
+    assert generate(output_dir) == ['docCmdGroup']
+    assert "@Element('verbatim', str)" in group.read_text()
+  finally:
+    shutil.rmtree(output_dir, ignore_errors=True)
+
+  print('OK')
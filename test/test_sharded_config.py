@@ -0,0 +1,29 @@
+import pathlib
+import shutil
+from xmlapigen.config_generator import ConfigGenerator
+
+if __name__ == '__main__':
+  here = pathlib.Path(__file__).parent.parent
+  output = '_build_sharded'
+  output_dir = here / output
+  xsds = [
+    str(here / 'test/_data/compound.xsd'),
+    str(here / 'test/_data/index.xsd')
+  ]
+
+  shutil.rmtree(output_dir, ignore_errors=True)
+  try:
+    ConfigGenerator(output, xsds).generate()
+    assert 'shards' not in (output_dir / 'config.yml').read_text()
+    assert not (output_dir / 'config.compound.yml').exists()
+
+    # Sharding an existing unsharded config converts it even though none of
+    # the xsds changed
+    ConfigGenerator(output, xsds, sharded=True).generate()
+    assert 'shards:' in (output_dir / 'config.yml').read_text()
+    assert (output_dir / 'config.compound.yml').exists()
+    assert (output_dir / 'config.index.yml').exists()
+  finally:
+    shutil.rmtree(output_dir, ignore_errors=True)
+
+  print('OK')
@@ -24,17 +24,18 @@ SOFTWARE.
 import pathlib
 import sys
 import os
-from .generator import cache
+from .generator.pool import map_jobs
 from .schema import Schema
-from .generator.classdef import ElementClassDef, element_factory, group_factory, type_factory
-from .generator.config import Config, COMPLEX
+from .generator.cache import SharedComponents
+from .generator.classdef import get_plural
+from .generator.config import Config, ATTRIBUTES, ENUMS, TYPES
 
 
 class ConfigGenerator():
     """Class responsible for generating xsd-based configuration and classes
     """
 
-    def __init__(self, output, inputs):
+    def __init__(self, output, inputs, cache_dir=None, jobs=1, config_name='config.yml', sharded=False):
         self._root = str(pathlib.Path(__file__).parent.parent)
         output = output if output is not None else '_build'
 
@@ -44,48 +45,206 @@ class ConfigGenerator():
             os.mkdir(self._output_dir);
 
         self._inputs = inputs
+        self._cache_dir = cache_dir
+        self._jobs = jobs
+        self._shared = None
 
         config_file = str(pathlib.Path(
-            self._output_dir + '/config.yml'))
+            self._output_dir + '/' + config_name))
 
-        self._config = Config(config_file)
+        self._config = Config(config_file, sharded)
+
+    def get_output_dir(self):
+        """Get the directory generated output is written to.
+
+        Returns:
+            str: The output directory.
+        """
+        return self._output_dir
+
+    def get_config(self):
+        """Get the configuration this generator writes to.
+
+        Returns:
+            Config: The config object
+        """
+        return self._config
 
     def load_schema(self, xsd):
         """Load the schema for the given xsd file.
 
         Args:
-            xsd (str): The xsd file name without the extension.
+            xsd (str): The xsd file path.
         """
-        self._schema = Schema(xsd)
+        self._schema = Schema(xsd, self._cache_dir, self._shared)
+
+    def get_schema(self):
+        return self._schema
+
+    def set_shared_components(self, shared):
+        """Share the wrappers of components declared in included xsds between
+        the schemas loaded from now on.
+
+        Args:
+            shared (SharedComponents|None): The registry to share wrappers
+                through, or None to stop sharing.
+        """
+        self._shared = shared
 
     def generate(self):
         """Generate the config for our final class generation.
         """
+        if self._jobs > 1 and len(self._inputs) > 1:
+          self._generate_parallel()
+          return
+
+        # Included xsds are shared between the schemas of this run only.
+        self.set_shared_components(SharedComponents())
+        try:
+          for inp in self._inputs:
+            self.generate_xsd(inp)
+        finally:
+          self.set_shared_components(None)
+
+    def _generate_parallel(self):
+        """Compile each xsd in its own worker process and merge the resulting
+        configuration sections into our config.
+        """
+        sections = map_jobs(
+            _compile_config_section,
+            [(inp, self._cache_dir) for inp in self._inputs],
+            self._jobs
+        )
+
+        self.write_sections(zip(self._inputs, sections))
+
+    def write_sections(self, sections):
+        """Merge the given xsd configuration sections into our config and
+        save it if anything changed.
+
+        Args:
+            sections (iterable): Pairs of xsd file paths and their
+                configuration sections.
+        """
+        config = self._config.load()
+        changed = False
+        for xsd, section in sections:
+            config.set_xsd(xsd)
+            changed = config.merge_xsd_config(section) or changed
+            changed = self._add_plurals(config, section) or changed
+
+        if changed or not config.exists() or config.is_layout_changed():
+            config.save()
+
+    @staticmethod
+    def _add_plurals(config, section):
+        """Add the plural collection keys of the enum values in the given
+        configuration section to the config's plural table.
+
+        Storing the plurals with the config saves class generation from
+        determining them again and allows them to be adjusted by hand.
+
+        Args:
+            config (Config): The config to add the plurals to.
+            section (dict): An xsd configuration section.
+
+        Returns:
+            bool: True if any plurals were added, False otherwise.
+        """
+        plurals = config.get_plurals()
+        added = False
+        for type_config in section.get(TYPES, {}).values():
+            enum_attrs = type_config.get(ATTRIBUTES, {}).get(ENUMS, {})
+            for enums in enum_attrs.values():
+                for enum in enums:
+                    if enum not in plurals:
+                        plurals[enum] = get_plural(enum)
+                        added = True
+
+        return added
+
+    def generate_xsd(self, xsd):
+        """Compile the given xsd and write its configuration.
 
-        for inp in self._inputs:
-          cache.clear()
-          schema = Schema(inp)
-          schema.compile()
-          self._write_config(inp)
+        The compiled schema and the populated cache are left in place so they
+        can be used to generate classes without building them again.
+
+        Args:
+            xsd (str): The xsd file path.
+        """
+        self.load_schema(xsd)
+        self.get_schema().compile()
+        self._write_config(xsd)
 
     def _write_config(self, xsd):
         """Create and write the configuration.
         """
-        # if config is None:
-        config = self._config.load()
-        config.set_xsd(xsd)
+        scratch = Config(None).load()
+        scratch.set_xsd(xsd)
+        self.add_cache_config(scratch, self.get_schema().get_cache())
+
+        self.write_sections([(xsd, scratch.get_xsd_config())])
+
+    @staticmethod
+    def add_cache_config(config, cache):
+        """Replace the configuration of the config's current xsd with the
+        data in the given cache.
+
+        Args:
+            config (Config): The config to add the cache data to.
+            cache (SchemaCache): The cache of the xsd's schema.
+        """
         config.clear_xsd()
 
         # Groups
-        for name, group_type in cache.get_group_cache().items():
+        for name, group_type in cache.get_groups().items():
             config.add_group_config(name, group_type)
 
         # Types
-        for name, node_type in cache.get_type_cache().items():
+        for name, node_type in cache.get_types().items():
             config.add_type_config(name, node_type)
 
         # Elements
-        for element_name, element_type in cache.get_element_cache():
+        for element_name, element_type in cache.get_elements():
             config.add_element_config(element_name, element_type)
 
-        self._config.save()
\ No newline at end of file
+
+def compile_config(xsd, cache_dir=None, plurals=None):
+    """Compile the given xsd and build its configuration in memory.
+
+    Args:
+        xsd (str): The xsd file path.
+        cache_dir (str, optional): The directory where compiled schemas are
+            persisted. Defaults to None.
+        plurals (dict, optional): The plural table of an existing
+            configuration to render classes with. Defaults to None.
+
+    Returns:
+        tuple: The compiled Schema and a Config holding the xsd's
+            configuration.
+    """
+    schema = Schema(xsd, cache_dir)
+    schema.compile()
+
+    config = Config(None).load()
+    if plurals:
+        config.get_plurals().update(plurals)
+    config.set_xsd(xsd)
+    ConfigGenerator.add_cache_config(config, schema.get_cache())
+
+    return schema, config
+
+
+def _compile_config_section(job):
+    """Worker entry point compiling the configuration section of an xsd.
+
+    Args:
+        job (tuple): The xsd file path and the cache directory.
+
+    Returns:
+        dict: The xsd's configuration section.
+    """
+    xsd, cache_dir = job
+    _, config = compile_config(xsd, cache_dir)
+
+    return config.get_xsd_config()
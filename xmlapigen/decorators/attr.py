@@ -27,18 +27,21 @@ class Attr(Decorator):
 
         return get_attribute
 
+    @staticmethod
+    def get_doc(attr_name, attr_type):
+        return f"""Return {attr_name} attribute value
+
+        Returns:
+            {attr_type}
+        """
+
+    @classmethod
+    def build_accessor(cls, fn_name, attr_name, attr_type):
+        return cls._getter(fn_name, attr_name, attr_type), cls.get_doc(attr_name, attr_type)
+
     def _add_attribute_method(self):
         name = self._attr_name
         attr_type = self._attr_type
 
-        doc = f"""Return {name} attribute value
-
-        Returns:
-            {self._attr_type}
-        """
         fn_name = f'get_{name}'
-        self.add_method_to_cls(
-            fn_name,
-            self._getter(fn_name, name, attr_type),
-            doc
-        )
+        self.add_accessor_to_cls(fn_name, self.build_accessor, name, attr_type)
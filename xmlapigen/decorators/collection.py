@@ -21,6 +21,8 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
+from functools import partial
+from types import MethodType
 from .decorator import Decorator
 from ..loader import Loader
 from ..util.generator.classdef import ClassDef
@@ -35,13 +37,14 @@ class Collection(Decorator):
     """Describe a collection of child elements in the decorated class which
        can be obtained through the use of xpath filters.
     """
-    __slots__ = ['_tag_name', '_node_type','_collectors_to_init']
+    __slots__ = ['_tag_name', '_node_type','_collectors_to_init', '_returns']
 
     def __init__(self, tag_name, node_type, collectors=None):
         super().__init__()
         self.tag_name = tag_name
         self.node_type = node_type
         self._collectors_to_init = collectors
+        self._returns = None
 
     @property
     def tag_name(self):
@@ -137,18 +140,30 @@ class Collection(Decorator):
                     xpath_methods = self.provide(self.collectors, xpath, {})
                     xpath_methods[getter] = args
 
-    @staticmethod
-    def _getter(fn_name, xpath_args=None):
-        def collect(self):
-            return self.get_collection(self.tag_name, xpath_args)
-        collect.__name__ = fn_name
+    def _get_returns(self):
+        """Get the qualified name of the class of this collection's tag.
 
-        return collect
+        The class is loaded the first time this is called.
 
-    def _add_collection_methods(self):
-        tag_class = Loader.load_tag_class(self.xsd, self.path)
-        collectors = self.collectors
+        Returns:
+            str: The module and name of the tag class.
+        """
+        if self._returns is None:
+            tag_class = Loader.load_tag_class(self.xsd, self.path)
+            self._returns = '.'.join([tag_class.__module__, tag_class.__name__])
+
+        return self._returns
+
+    def get_doc(self, xpath_args=None):
+        """Get the documentation of one of this collection's accessors.
 
+        Args:
+            xpath_args (list, optional): The xpath pattern and its argument.
+                Defaults to None, for the accessor collecting every child.
+
+        Returns:
+            str: The accessor's documentation.
+        """
         main_doc_template = f'Return child {self.tag_name} elements'
         collection_doc_template = main_doc_template + ' matching xpath \'{tag}/{filter}\''
         return_template = """
@@ -157,25 +172,108 @@ class Collection(Decorator):
             list({returns}): A list of {tag} elements found.
         """
 
+        if xpath_args is None:
+            return main_doc_template + return_template.format(
+                tag=self.tag_name,
+                returns=self._get_returns()
+            )
+
+        pattern, pattern_arg = xpath_args
+        return (collection_doc_template + return_template).format(
+            tag=self.tag_name,
+            filter=pattern.format(pattern_arg),
+            returns=self._get_returns()
+        ).strip()
+
+    def build_accessor(self, fn_name, xpath_args=None):
+        """Build one of this collection's accessors.
+
+        The accessor documents itself when its docs are first read, so the
+        class of the collection's tag is not loaded while decorating.
+
+        Args:
+            fn_name (str): The name of the accessor.
+            xpath_args (list, optional): The xpath pattern and its argument.
+                Defaults to None, in which case every child is collected.
+
+        Returns:
+            tuple: The accessor and None, as it provides its own docs.
+        """
+        return CollectionGetter(fn_name, xpath_args, partial(self.get_doc, xpath_args)), None
+
+    def _add_collection_methods(self):
+        collectors = self.collectors
+
         #Our main collection tag should have a method where all elements
         #matching the tag name are returned. This method will not use any
         #xpath arguments and will simply return all elements matching the
         #tag name.
         fn_name = f'get_{self.tag_name}s'
-        doc = main_doc_template + return_template.format(
-            tag=self.tag_name,
-            returns='.'.join([tag_class.__module__, tag_class.__name__])
-        )
-        self.add_method_to_cls(fn_name, self._getter(fn_name), doc)
+        self.add_accessor_to_cls(fn_name, self.build_accessor)
 
         if collectors:
             for pattern, xpath_args in collectors.items():
                 for method_tail, pattern_arg in xpath_args.items():
                     fn_name = f'get_{self.tag_name}_{method_tail}'
-                    get = self._getter(fn_name, [pattern, pattern_arg])
-                    doc = (collection_doc_template + return_template).format(
-                        tag=self.tag_name,
-                        filter=pattern.format(pattern_arg),
-                        returns='.'.join([tag_class.__module__, tag_class.__name__])
-                    ).strip()
-                    self.add_method_to_cls(fn_name, get, doc)
+                    self.add_accessor_to_cls(fn_name, self.build_accessor, [pattern, pattern_arg])
+
+
+class LazyDoc():
+    """Class attribute serving a class' own docstring when read from the
+       class and the documentation an instance builds when read from the
+       instance.
+    """
+    __slots__ = ['_doc']
+
+    def __init__(self, doc):
+        """
+        Args:
+            doc (str): The class' docstring.
+        """
+        self._doc = doc
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self._doc
+
+        return instance.get_doc()
+
+
+class CollectionGetter():
+    __doc__ = LazyDoc(
+        """Accessor of a collection whose documentation is only built, and the
+           class of its tag only loaded, when the documentation is read.
+        """
+    )
+
+    def __init__(self, fn_name, xpath_args, build_doc):
+        """
+        Args:
+            fn_name (str): The name of the accessor.
+            xpath_args (list|None): The xpath pattern and its argument.
+            build_doc (callable): Returns the accessor's documentation.
+        """
+        self.__name__ = fn_name
+        self._xpath_args = xpath_args
+        self._build_doc = build_doc
+        self._doc = None
+
+    def get_doc(self):
+        """Get the accessor's documentation, building it on first use.
+
+        Returns:
+            str: The documentation.
+        """
+        if self._doc is None:
+            self._doc = self._build_doc()
+
+        return self._doc
+
+    def __call__(self, node):
+        return node.get_collection(node.tag_name, self._xpath_args)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        return MethodType(self, instance)
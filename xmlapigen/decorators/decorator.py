@@ -24,6 +24,65 @@ SOFTWARE.
 from abc import ABC, abstractmethod
 META = '_meta'
 
+# Whether accessors are built on first use rather than when the class is
+# decorated. See set_lazy_accessors().
+_lazy_accessors = False
+
+
+def set_lazy_accessors(lazy=True):
+    """Opt in to building accessors on first use.
+
+    Decorated classes still get their metadata as soon as they are decorated,
+    but the closure and docstring of each accessor are only created the first
+    time the accessor is looked up, after which it is cached on the class.
+    Only classes decorated after the call are affected.
+
+    Args:
+        lazy (bool, optional): Whether accessors should be built lazily.
+            Defaults to True.
+    """
+    global _lazy_accessors
+    _lazy_accessors = lazy
+
+
+class LazyAccessor():
+    """Class attribute standing in for an accessor until it is first used.
+
+    On first lookup the accessor is built and replaces this descriptor on the
+    class it was added to.
+    """
+    __slots__ = ['_cls', '_fn_name', '_build', '_args']
+
+    def __init__(self, cls, fn_name, build, *args):
+        """
+        Args:
+            cls (type): The class the accessor belongs to.
+            fn_name (str): The name of the accessor.
+            build (callable): Called with fn_name and args, returns the
+                accessor and its documentation.
+            *args: Additional arguments for build.
+        """
+        self._cls = cls
+        self._fn_name = fn_name
+        self._build = build
+        self._args = args
+
+    def resolve(self):
+        """Build the accessor and cache it on its class.
+
+        Returns:
+            callable: The accessor.
+        """
+        getter, doc = self._build(self._fn_name, *self._args)
+        if doc is not None:
+            getter.__doc__ = doc
+        setattr(self._cls, self._fn_name, getter)
+
+        return getter
+
+    def __get__(self, instance, owner=None):
+        return self.resolve().__get__(instance, owner)
+
 class Decorator(ABC):
     """Abstract base class for all decorators
     """
@@ -100,11 +159,31 @@ class Decorator(ABC):
         Args:
             fn_name (str): The name of the method.
             getter (callable): The method itself.
-            doc (str): The documentation for the method.
+            doc (str|None): The documentation for the method, or None if the
+                method provides its own.
         """
-        getter.__doc__ = doc
+        if doc is not None:
+            getter.__doc__ = doc
         setattr(self.cls, fn_name, getter)
 
+    def add_accessor_to_cls(self, fn_name, build, *args):
+        """Add an accessor to this decorator's cls.
+
+        The accessor is added right away unless lazy accessors were opted in
+        to with set_lazy_accessors(), in which case it is only built the
+        first time it is looked up.
+
+        Args:
+            fn_name (str): The name of the accessor.
+            build (callable): Called with fn_name and args, returns the
+                accessor and its documentation.
+            *args: Additional arguments for build.
+        """
+        if _lazy_accessors:
+            setattr(self.cls, fn_name, LazyAccessor(self.cls, fn_name, build, *args))
+        else:
+            self.add_method_to_cls(fn_name, *build(fn_name, *args))
+
     @staticmethod
     def provide(data, key, default):
         """Provide the given data with a default value at key if none exists.
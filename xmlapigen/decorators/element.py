@@ -52,6 +52,18 @@ class Element(Decorator):
 
         return get_element
 
+    @staticmethod
+    def get_doc(tag_name, node_type):
+        return f"""Return child {tag_name} element
+
+        Returns:
+            {node_type}: The model representing the {tag_name}.
+        """
+
+    @classmethod
+    def build_accessor(cls, fn_name, tag_name, node_type):
+        return cls._getter(fn_name, tag_name, node_type), cls.get_doc(tag_name, node_type)
+
     def _add_element_method(self):
         xsd = self.xsd
         name = self._tag_name
@@ -64,14 +76,5 @@ class Element(Decorator):
         if node_type is None:
             raise Exception(f'Cannot add {name} element method because its type cannot be determined!')
 
-        doc = f"""Return child {name} element
-
-        Returns:
-            {node_type}: The model representing the {name}.
-        """
         fn_name = f'get_{name}'
-        self.add_method_to_cls(
-            fn_name,
-            self._getter(fn_name, name, node_type),
-            doc
-        )
+        self.add_accessor_to_cls(fn_name, self.build_accessor, name, node_type)
@@ -0,0 +1,108 @@
+"""
+MIT License
+
+Copyright (c) 2020 Collin Brooks
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from .decorator import Decorator
+from .attr import Attr, ATTRIBUTES
+from .collection import Collection, COLLECTIONS, COLLECTORS
+from .element import Element, ELEMENTS, TYPE
+from .placeholders import PLACEHOLDERS
+from .tag import TAG
+
+
+class Schema(Decorator):
+    """Describe everything a generated class exposes with a single metadata
+    table and install all of its accessors in one pass.
+
+    The table holds the same data the individual Tag, Placeholders, Attr,
+    BoolAttr, Element and Collection decorators would add to the class'
+    metadata.
+    """
+    __slots__ = ['_table']
+
+    def __init__(self, table):
+        """
+        Args:
+            table (dict): The class' metadata table.
+        """
+        super().__init__()
+        self._table = table
+
+    def do(self):
+        meta = self.meta
+        table = self._table
+
+        if TAG in table:
+            self.provide(meta, TAG, table[TAG])
+        if PLACEHOLDERS in table:
+            self.provide(meta, PLACEHOLDERS, table[PLACEHOLDERS])
+
+        # Accessors are installed in the order the individual decorators
+        # would have been applied.
+        self._add_elements(meta, table.get(ELEMENTS, {}))
+        for tag_name, collection in table.get(COLLECTIONS, {}).items():
+            Collection(
+                tag_name,
+                collection[TYPE],
+                collection.get(COLLECTORS)
+            )(self.cls)
+        self._add_attributes(meta, table.get(ATTRIBUTES, {}))
+
+    def _add_elements(self, meta, elements):
+        """Add the metadata and accessor of each of the given elements.
+
+        Args:
+            meta (dict): The class' metadata.
+            elements (dict): The element table keyed by tag name.
+
+        Raises:
+            Exception: If an element's type can not be determined.
+        """
+        if not elements:
+            return
+
+        element_meta = self.provide(meta, ELEMENTS, {})
+        for name, element in elements.items():
+            node_type = self.provide(element_meta, name, element).get(TYPE)
+            if node_type is None:
+                raise Exception(f'Cannot add {name} element method because its type cannot be determined!')
+
+            fn_name = f'get_{name}'
+            self.add_accessor_to_cls(fn_name, Element.build_accessor, name, node_type)
+
+    def _add_attributes(self, meta, attributes):
+        """Add the metadata and accessor of each of the given attributes.
+
+        Args:
+            meta (dict): The class' metadata.
+            attributes (dict): The attribute table keyed by attribute name.
+        """
+        if not attributes:
+            return
+
+        attribute_meta = self.provide(meta, ATTRIBUTES, {})
+        for name, attribute in attributes.items():
+            self.provide(attribute_meta, name, attribute)
+            attr_type = attribute[TYPE]
+
+            fn_name = f'get_{name}'
+            self.add_accessor_to_cls(fn_name, Attr.build_accessor, name, attr_type)
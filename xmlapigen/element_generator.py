@@ -21,25 +21,44 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
+import hashlib
+import json
 import pathlib
 import sys
 import os
-from .generator import cache
-from .generator.classdef import ElementClassDef, element_factory, group_factory, type_factory
-from .generator.config import Config, COMPLEX
+from collections.abc import Mapping
+from .generator import classdef, config as config_module, files, store
+from .generator.cache import SharedComponents
+from .generator.pool import map_jobs
+from .generator.classdef import ClassDef, STYLE_DECORATORS, render_class, render_inputs
+from .generator.config import Config, COMPLEX, GROUPS, TYPES, ELEMENTS
+
+MANIFEST = '.manifest.json'
+VERSION = 'version'
+FILES = 'files'
+
+# The config and class style used by render worker processes
+_render_config = None
+_render_style = STYLE_DECORATORS
 
 
 class ElementGenerator():
     """Class responsible for generating xsd-based configuration and classes
     """
 
-    def __init__(self, output, config_file):
+    def __init__(self, output, config_file, cache_dir=None, jobs=1, render_jobs=1, incremental=False, style=STYLE_DECORATORS):
         self._root = str(pathlib.Path(__file__).parent.parent)
         self._output_dir = output
         self._xmldir = self._root + '/../test/_sample_data/_build/php/xml/'
         self._config = Config(config_file)
         self._xsd_out_dir = output + '/xsd/'
         self._schema = None
+        self._cache_dir = cache_dir
+        self._jobs = jobs
+        self._render_jobs = render_jobs
+        self._incremental = incremental
+        self._style = style
+        self._shared = None
 
     def load_schema(self, xsd):
         from .schema import Schema
@@ -48,22 +67,50 @@ class ElementGenerator():
         Args:
             xsd (str): The xsd file path.
         """
-        self._schema = Schema(xsd)
+        self._schema = Schema(xsd, self._cache_dir, self._shared)
 
     def get_schema(self):
         return self._schema
 
+    def set_shared_components(self, shared):
+        """Share the wrappers of components declared in included xsds between
+        the schemas loaded from now on.
+
+        Args:
+            shared (SharedComponents|None): The registry to share wrappers
+                through, or None to stop sharing.
+        """
+        self._shared = shared
+
+    def set_schema(self, schema):
+        """Use an already compiled schema instead of loading one.
+
+        Args:
+            schema (Schema): The schema of the xsd being generated.
+        """
+        self._schema = schema
+
+    def set_config(self, config):
+        """Use an already loaded config instead of the one at the config file
+        path.
+
+        Args:
+            config (Config): The config object
+        """
+        self._config = config
+
     @staticmethod
     def _write(path, content):
         """Write the content to the file at the given path.
 
+        Identical files are skipped and changed files are replaced
+        atomically.
+
         Args:
             path (str): The location where we should write the content.
             content (str): The content to write.
         """
-        file = open(path, 'w')
-        file.write(content)
-        file.close()
+        files.write(path, content)
 
     @staticmethod
     def _append(path, content):
@@ -128,83 +175,289 @@ class ElementGenerator():
         """
         return self._get_dir_for_xsd(xsd) + 'groups/'
 
-    def _generate_groups(self, xsd_file):
-        config = self._config
+    def _group_jobs(self, xsd_file, config):
+        """Get the render jobs for the groups of the given xsd.
+
+        Args:
+            xsd_file (str): The xsd file path.
+            config (Config): The config to generate from.
+
+        Returns:
+            list: A list of output path and render job tuples.
+        """
         groups_dir = self._get_groups_dir(xsd_file)
         groups = config.get_groups()
         schema = self.get_schema()
         if len(groups) > 0:
             self._write_package_folders([groups_dir])
 
+        jobs = []
         for group_name in groups.keys():
-            class_def = group_factory(
-                group_name,
-                config,
-                schema.get_group_definition(group_name),
-                schema.get_group_element_definitions(group_name)
-            )
-            out = groups_dir + class_def.get_file_name(group_name) + '.py'
-            self._write(
-                out,
-                str(class_def)
-            )
+            jobs.append((
+                groups_dir + ClassDef.get_file_name(group_name) + '.py',
+                (
+                    GROUPS,
+                    group_name,
+                    schema.get_group_definition(group_name),
+                    # Only complex children are embedded in the class.
+                    schema.get_group_element_definitions(
+                        group_name,
+                        config.get_group_elements(group_name).get(COMPLEX, {})
+                    )
+                )
+            ))
+
+        return jobs
+
+    def _type_jobs(self, xsd_name, config):
+        """Get the render jobs for the types of the given xsd.
+
+        Args:
+            xsd_name (str): The xsd file path.
+            config (Config): The config to generate from.
 
-    def _generate_types(self, xsd_name):
-        config = self._config
+        Returns:
+            list: A list of output path and render job tuples.
+        """
         types_dir = self._get_types_dir(xsd_name)
         types = config.get_types()
         schema = self.get_schema()
         if len(types) > 0:
             self._write_package_folders([types_dir])
 
-        # Types
+        jobs = []
         for type_name in types.keys():
-            class_def = type_factory(
-                type_name,
-                self._config,
-                schema.get_type_definition(type_name),
-                schema.get_type_element_definitions(type_name)
-            )
-            self._write(
-                types_dir + class_def.get_file_name(type_name) + '.py',
-                str(class_def)
-            )
+            jobs.append((
+                types_dir + ClassDef.get_file_name(type_name) + '.py',
+                (
+                    TYPES,
+                    type_name,
+                    schema.get_type_definition(type_name),
+                    # Only complex children are embedded in the class.
+                    schema.get_type_element_definitions(
+                        type_name,
+                        config.get_type_elements(type_name).get(COMPLEX, {})
+                    )
+                )
+            ))
+
+        return jobs
+
+    def _element_jobs(self, xsd_name, config):
+        """Get the render jobs for the global elements of the given xsd.
 
-    def _generate_elements(self, xsd_name):
-        config = self._config
+        Args:
+            xsd_name (str): The xsd file path.
+            config (Config): The config to generate from.
+
+        Returns:
+            list: A list of output path and render job tuples.
+        """
         elements_dir = self._get_elements_dir(xsd_name)
         elements = config.get_elements()
         schema = self.get_schema()
         if len(elements) > 0:
             self._write_package_folders([elements_dir])
 
-        # Elements
+        jobs = []
         for element_name, element_type in elements.items():
-            class_def = element_factory(
-                element_name,
-                element_type,
-                schema.get_element_definition(element_name),
-                self._config,
-            )
-            ElementGenerator._write(
-                elements_dir +
-                class_def.get_file_name(element_name) + '.py',
-                str(class_def)
+            jobs.append((
+                elements_dir + ClassDef.get_file_name(element_name) + '.py',
+                (
+                    ELEMENTS,
+                    element_name,
+                    element_type,
+                    schema.get_element_definition(element_name)
+                )
+            ))
+
+        return jobs
+
+    def _render(self, config, jobs):
+        """Render the class definitions of the given render jobs.
+
+        When more than one render job is requested, the jobs are spread over
+        a pool of worker processes which are handed the config once, up
+        front. The results are identical to rendering serially.
+
+        Args:
+            config (FrozenConfig): The config to render from.
+            jobs (list): A list of render jobs.
+
+        Returns:
+            list: The rendered classes in the order of the given jobs.
+        """
+        if self._render_jobs > 1 and len(jobs) > 1:
+            return map_jobs(
+                _render_job,
+                jobs,
+                self._render_jobs,
+                initializer=_init_render_worker,
+                initargs=(config, self._style)
             )
 
+        return [render_class(config, *job, style=self._style) for job in jobs]
+
     def generate(self):
         """Generate the classes based on our config.
         """
-        from .generator import cache
+        config = self._config.load()
+        xsd_files = list(config.get_xsd_files())
+        if self._jobs > 1 and len(xsd_files) > 1:
+            jobs = []
+            for xsd_file in xsd_files:
+                # Workers load the configuration file of a sharded xsd
+                # themselves.
+                xsd_config = None
+                if not config.is_sharded():
+                    config.set_xsd(xsd_file)
+                    xsd_config = config.freeze()
+                jobs.append((
+                    self._output_dir,
+                    xsd_file,
+                    config.get_path(),
+                    xsd_config,
+                    self._cache_dir,
+                    self._incremental,
+                    self._style
+                ))
+            map_jobs(_generate_xsd_elements, jobs, self._jobs)
+            return
+
+        # Included xsds are shared between the schemas of this run only.
+        self.set_shared_components(SharedComponents())
+        try:
+            for xsd_file in xsd_files:
+                self.load_schema(xsd_file)
+                self.generate_xsd(xsd_file)
+        finally:
+            self.set_shared_components(None)
+
+    def generate_xsd(self, xsd_file):
+        """Generate the classes for the given xsd using the current schema.
 
+        Args:
+            xsd_file (str): The xsd file path.
+        """
         config = self._config.load()
-        for xsd_file in config.get_xsd_files():
-            cache.clear()
-            self.load_schema(xsd_file)
-            config.set_xsd(xsd_file)
-            self._generate_groups(xsd_file)
-            self._generate_types(xsd_file)
-            self._generate_elements(xsd_file)
+        config.set_xsd(xsd_file)
+        config = config.freeze()
+
+        jobs = self._group_jobs(xsd_file, config)
+        jobs += self._type_jobs(xsd_file, config)
+        jobs += self._element_jobs(xsd_file, config)
+
+        if self._incremental:
+            jobs, entries = self._filter_unchanged(xsd_file, jobs, config)
+
+        rendered = self._render(config, [job for _, job in jobs])
+        for (out, _), content in zip(jobs, rendered):
+            self._write(out, content)
+
+        if self._incremental:
+            self._write_manifest(xsd_file, entries)
+
+    @staticmethod
+    def get_generator_version():
+        """Get the version of the code which determines the generated output.
+
+        Returns:
+            str: A digest of the class rendering code.
+        """
+        return store.source_digest(classdef, config_module)
+
+    @staticmethod
+    def _get_job_key(config, job, version):
+        """Get a key which changes whenever the output of the given render
+        job would.
+
+        Args:
+            config (Config): The config the job is rendered from.
+            job (tuple): The render job.
+            version (str): The generator version.
+
+        Returns:
+            str: The render job's key.
+        """
+        data = json.dumps(
+            [version, job, render_inputs(config, *job)],
+            sort_keys=True,
+            default=_json_default
+        )
+
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _get_manifest_version(self):
+        """Get the version recorded in the manifests of the generated xsds.
+
+        Returns:
+            str: The generator version and class style.
+        """
+        # Switching styles changes every class.
+        return f'{self.get_generator_version()}-{self._style}'
+
+    def _filter_unchanged(self, xsd_file, jobs, config):
+        """Remove the jobs whose output is already up to date according to
+        the manifest of the given xsd.
+
+        Files recorded in the manifest which are no longer generated are
+        deleted. The manifest itself is left alone until the changed jobs
+        have been written, see _write_manifest().
+
+        Args:
+            xsd_file (str): The xsd file path.
+            jobs (list): A list of output path and render job tuples.
+            config (Config): The config the jobs are rendered from.
+
+        Returns:
+            tuple: The output path and render job tuples which need
+                rendering, and the manifest entries of every job.
+        """
+        xsd_dir = self._get_dir_for_xsd(xsd_file)
+        manifest_path = xsd_dir + MANIFEST
+        version = self._get_manifest_version()
+
+        known = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r') as manifest_file:
+                known = json.load(manifest_file).get(FILES, {})
+
+        entries = {}
+        changed = []
+        for out, job in jobs:
+            name = os.path.relpath(out, xsd_dir)
+            entries[name] = self._get_job_key(config, job, version)
+            if known.get(name) != entries[name] or not os.path.exists(out):
+                changed.append((out, job))
+
+        for name in known.keys() - entries.keys():
+            removed = os.path.join(xsd_dir, name)
+            if os.path.exists(removed):
+                os.remove(removed)
+
+        return changed, entries
+
+    def _write_manifest(self, xsd_file, entries):
+        """Write the manifest of the given xsd.
+
+        This must only happen once every file in the manifest has been
+        written, otherwise an interrupted run would leave stale files which
+        the next run considers up to date.
+
+        Args:
+            xsd_file (str): The xsd file path.
+            entries (dict): The job keys of the generated files.
+        """
+        xsd_dir = self._get_dir_for_xsd(xsd_file)
+        os.makedirs(xsd_dir, exist_ok=True)
+        self._write(
+            xsd_dir + MANIFEST,
+            json.dumps(
+                {VERSION: self._get_manifest_version(), FILES: entries},
+                indent=2,
+                sort_keys=True
+            ) + "\n"
+        )
 
     @staticmethod
     def _write_package_folders(dirs):
@@ -220,27 +473,72 @@ class ElementGenerator():
             if not init.exists():
                 init.touch()
 
-    def _write_config(self):
-        """Create and write the configuration.
-        """
-        # if config is None:
-        config = self._config.load()
-        config.set_xsd(self._xsd)
-        config.clear_xsd()
 
-        # Groups
-        for name, group_type in cache.get_group_cache().items():
-            config.add_group_config(name, group_type)
+def _json_default(value):
+    """Serialize the values json doesn't know how to handle.
+
+    Args:
+        value (mixed): The value to serialize.
+
+    Returns:
+        dict|str: Mappings, such as lazily serialized element definitions,
+            as a dict and anything else as a string.
+    """
+    if isinstance(value, Mapping):
+        return dict(value)
 
-        # Types
-        for name, node_type in cache.get_type_cache().items():
-            config.add_type_config(name, node_type)
+    return str(value)
 
-        # Elements
-        for element_name, element_type in cache.get_element_cache():
-            config.add_element_config(element_name, element_type)
 
-        self._config.save()
+def _init_render_worker(config, style=STYLE_DECORATORS):
+    """Set up the config and class style used by a render worker process.
+
+    Args:
+        config (FrozenConfig): The config to render from.
+        style (str, optional): The style classes are rendered in. Defaults
+            to STYLE_DECORATORS.
+    """
+    global _render_config, _render_style
+
+    _render_config = config
+    _render_style = style
+
+
+def _render_job(job):
+    """Worker entry point rendering a single class definition.
+
+    Args:
+        job (tuple): The render job.
+
+    Returns:
+        str: The rendered class.
+    """
+    return render_class(_render_config, *job, style=_render_style)
+
+
+def _generate_xsd_elements(job):
+    """Worker entry point generating the classes of a single xsd.
+
+    Args:
+        job (tuple): The output directory, the xsd file path, the config
+            file path, a frozen config of the xsd (None to load it from a
+            sharded config file), the cache directory, whether or not to
+            generate incrementally and the class style.
+    """
+    output, xsd_file, config_file, config, cache_dir, incremental, style = job
+    if config is None:
+        config = Config(config_file)
+
+    generator = ElementGenerator(
+        output,
+        None,
+        cache_dir,
+        incremental=incremental,
+        style=style
+    )
+    generator.set_config(config)
+    generator.load_schema(xsd_file)
+    generator.generate_xsd(xsd_file)
 
 
 if __name__ == "__main__":
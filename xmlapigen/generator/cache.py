@@ -23,118 +23,372 @@ SOFTWARE.
 
 This module contains cache helpers for the different xsd elements doxyparser works with
 """
-from .types import Group, Type, Element
+import threading
+from xmlschema.names import XSD_NAMESPACE
+from .types import Group, Type, Element, get_type_wrapper
+from .walker import index_component, index_enums, index_schema, resolve_enum_values
 
-group_cache = {}
-type_cache = {}
-element_cache = {}
+GROUP = 'group'
+TYPE = 'type'
+ELEMENT = 'element'
+HITS = 'hits'
+MISSES = 'misses'
 
-def clear():
-    group_cache.clear()
-    type_cache.clear()
-    element_cache.clear()
 
-def get_group_cache():
-    """Get the group cache.
+class SchemaCache():
+    """Indexed store of the wrapped groups, types and elements of a schema.
 
-    Returns:
-        dict: Group cache data keyed by group name.
+    Components are indexed by kind and qualified name, and elements are
+    additionally indexed by the name of their type. Lookups are counted so
+    hit rates can be inspected with get_stats().
+
+    Each Schema owns its own cache. When given a SharedComponents registry,
+    components declared in an xsd included by the schema are wrapped once
+    and shared with every other cache of the registry whose schema includes
+    the same xsd, so their children are only built once.
     """
-    return group_cache
 
+    def __init__(self, url=None, shared=None):
+        """
+        Args:
+            url (str, optional): The url of the schema's own xsd. Components
+                declared elsewhere are shared between caches. Defaults to
+                None, in which case nothing is shared.
+            shared (SharedComponents, optional): The registry components
+                declared elsewhere are shared through. Defaults to None, in
+                which case nothing is shared.
+        """
+        self._url = url
+        self._shared = shared
+        self._by_kind = {GROUP: {}, TYPE: {}, ELEMENT: {}}
+        self._by_type = {}
+        self._children = {}
+        self._wrappers = {}
+        self._enums = {}
+        self._stats = {kind: {HITS: 0, MISSES: 0} for kind in self._by_kind}
+
+    @staticmethod
+    def _key(component):
+        """Get the qualified name of the given component.
+
+        Args:
+            component (str|XsdComponent|None): A qualified name or an
+                xmlschema component.
+
+        Returns:
+            str|None: The qualified name.
+        """
+        if component is None or isinstance(component, str):
+            return component
+
+        return component.name
+
+    @classmethod
+    def _element_key(cls, element):
+        """Get the key of the given element.
+
+        Elements are keyed by their qualified name and the qualified name
+        of their type.
+
+        Args:
+            element (XsdElement): The element.
+
+        Returns:
+            tuple: The element's key.
+        """
+        return (element.name, cls._key(element.type))
+
+    def _lookup(self, kind, key):
+        """Look up the component of the given kind and count the lookup.
+
+        Args:
+            kind (str): One of GROUP, TYPE or ELEMENT.
+            key (mixed): The component's key.
+
+        Returns:
+            Group|Type|Element|None: The cached component.
+        """
+        component = self._by_kind[kind].get(key)
+        self._stats[kind][HITS if component is not None else MISSES] += 1
+
+        return component
+
+    def _wrap(self, kind, key, component, wrapper, *args):
+        """Wrap the given component, reusing the shared wrapper if the
+        component is declared in an included xsd.
+
+        Args:
+            kind (str): One of GROUP, TYPE or ELEMENT.
+            key (mixed): The component's key.
+            component (XsdComponent): The component to wrap.
+            wrapper (type): The class to wrap the component with.
+            *args: Additional arguments for the wrapper.
+
+        Returns:
+            Group|Type|Element: The wrapped component.
+        """
+        if self._shared is None:
+            return wrapper(component, *args, cache=self)
+
+        return self._shared.wrap(
+            self._url, kind, key, component, wrapper, *args, cache=self)
+
+    def clear(self):
+        """Remove every component and reset the lookup counters.
+        """
+        for components in self._by_kind.values():
+            components.clear()
+        self._by_type.clear()
+        self._children.clear()
+        self._wrappers.clear()
+        self._enums.clear()
+        for stats in self._stats.values():
+            stats[HITS] = stats[MISSES] = 0
+
+    def index(self, schema):
+        """Index the children of every global group and complex type of the
+        given schema in a single walk, along with the enum values of their
+        attribute types.
+
+        Args:
+            schema (XMLSchema): The schema to index.
+        """
+        children = index_schema(schema)
+        self._children.update(children)
+        self._enums.update(index_enums(children))
+
+    def get_enum_values(self, node_type):
+        """Get the enum values allowed by the given type.
+
+        Types which weren't seen while indexing are resolved on first use.
+
+        Args:
+            node_type (XsdType): The type.
+
+        Returns:
+            list: A list of enum values
+        """
+        try:
+            return self._enums[node_type]
+        except KeyError:
+            enums = self._enums[node_type] = resolve_enum_values(node_type)
+            return enums
+
+    def get_children(self, definition):
+        """Get the indexed children of the given definition.
+
+        Definitions which weren't indexed up front, such as anonymous types,
+        are indexed on first use.
 
-def get_type_cache():
-    """Get the type cache.
+        Args:
+            definition (XsdComponent): The type or group.
 
-    Returns:
-        dict: Type cache data keyed by type name.
-    """
-    return type_cache
+        Returns:
+            dict: The definition's ELEMENTS, GROUPS and ATTRIBUTES.
+        """
+        children = self._children.get(definition)
+        if children is None:
+            children = index_component(definition)
+            self._children[definition] = children
+
+        return children
+
+    def get_stats(self):
+        """Get the lookup counters of each kind of component.
+
+        Returns:
+            dict: HITS and MISSES counts keyed by GROUP, TYPE and ELEMENT.
+        """
+        return self._stats
+
+    def get_groups(self):
+        return self._by_kind[GROUP]
+
+    def get_types(self):
+        return self._by_kind[TYPE]
+
+    def get_elements(self):
+        return self._by_kind[ELEMENT]
 
+    def get_group(self, group):
+        return self._lookup(GROUP, self._key(group))
 
-def get_element_cache():
-    """Get the element cache.
+    def get_type(self, node_type):
+        return self._lookup(TYPE, self._key(node_type))
+
+    def get_element(self, element):
+        return self._lookup(ELEMENT, self._element_key(element))
+
+    def get_type_wrapper(self, node_type):
+        """Get the Type wrapping the given type of an attribute or element.
+
+        Cached complex types are reused. Any other type, such as a builtin or
+        anonymous simple type, is wrapped the first time it is seen and
+        reused afterwards, so its classification only happens once.
+
+        Args:
+            node_type (XsdType): The type.
+
+        Returns:
+            Type: The wrapped type.
+        """
+        wrapped = None
+        if node_type.name is not None:
+            wrapped = self._by_kind[TYPE].get(node_type.name)
+        if wrapped is None:
+            wrapped = self._wrappers.get(node_type)
 
-    Returns:
-        list: List of element data cache
-    """
-    return element_cache
+        self._stats[TYPE][HITS if wrapped is not None else MISSES] += 1
+        if wrapped is None:
+            wrapped = get_type_wrapper(node_type, self)
+            self._wrappers[node_type] = wrapped
 
+        return wrapped
 
-def get_group(group_name):
-    """Get the Group from cache for the group with the given name.
+    def get_elements_of_type(self, node_type):
+        """Get the cached elements whose type has the given name.
 
-    Args:
-        group_name (str): The name of the group to obtain cache data for.
+        Args:
+            node_type (str|XsdType): The type or its qualified name.
 
-    Returns:
-        Group|None: The Group object for the group with the given name or
-            none if it does not exist.
-    """
-    return group_cache.get(group_name)
+        Returns:
+            list: The Elements of the given type.
+        """
+        return self._by_type.get(self._key(node_type), [])
 
+    def get_type_or_define(self, type_name, node_type):
+        my_type = self.get_type(type_name)
+        if my_type is None and node_type is not None:
+            my_type = self.add_type(node_type)
 
-def get_type(type_name):
-    """Get the Type from cache for the type with the given name.
+        return my_type
 
-    Args:
-        type_name (str): The name of the type to obtain cache data for.
+    def get_group_or_define(self, group_name, group):
+        my_group = self.get_group(group_name)
+        if my_group is None and group is not None:
+            my_group = self.add_group(group)
 
-    Returns:
-        Type|None: The Type object for the type with the given name or none
-            if it does not exist.
-    """
-    return type_cache.get(type_name)
+        return my_group
 
-def get_element(element):
-    name = element.name
-    node_type = element.node_type
+    def get_element_or_define(self, element):
+        my_element = self.get_element(element)
+        if my_element is None:
+            my_element = self.add_element(element)
 
-    return element_cache.get((name, node_type))
+        return my_element
 
-def get_type_or_define(type_name, node_type):
-    if get_type(type_name) is None:
-        add_type(node_type)
+    def add_group(self, group):
+        """Add the given group to cache
 
-    return get_type(type_name)
+        Args:
+            group (XsdGroup): The XsdGroup to add to cache
 
-def get_group_or_define(group_name, group):
-    if get_group(group_name) is None:
-        add_group(group)
+        Returns:
+            Group: The cached Group.
+        """
+        wrapped = self._wrap(GROUP, group.name, group, Group)
+        self._by_kind[GROUP][group.name] = wrapped
 
-    return get_group(group_name)
+        return wrapped
 
-def get_element_or_define(element):
-    if get_element(element) is None:
-        add_element(element)
+    def add_type(self, node_type):
+        """Add the given type to cache
 
-    return get_element(element)
+        Args:
+            node_type (XsdType): The XsdType to add to cache
 
-def add_group(group):
-    """Add the given group to cache
+        Returns:
+            Type: The cached Type.
+        """
+        wrapped = self._wrap(TYPE, node_type.name, node_type, Type)
+        self._by_kind[TYPE][node_type.name] = wrapped
 
-    Args:
-        group (XsdGroup): The XsdGroup to add to cache
-    """
-    group_cache[group.name] = Group(group)
+        return wrapped
 
+    def add_element(self, element):
+        """Add the given element to cache
 
-def add_type(node_type):
-    """Add the given type to cache
+        Args:
+            element (XsdElement): The XsdElement to add to cache
 
-    Args:
-        group (XsdType): The XsdType to add to cache
-    """
-    type_cache[node_type.name] = Type(node_type)
+        Returns:
+            Element: The cached Element.
+        """
+        key = self._element_key(element)
+        wrapped = self._wrap(
+            ELEMENT,
+            key,
+            element,
+            Element,
+            self._by_kind[TYPE].get(key[1])
+        )
+        self._by_kind[ELEMENT][key] = wrapped
+        self._by_type.setdefault(key[1], []).append(wrapped)
+
+        return wrapped
+
+    def __getstate__(self):
+        # Shared wrappers only live as long as the run does, and lookups are
+        # only counted for the process doing them.
+        state = self.__dict__.copy()
+        state['_url'] = None
+        state['_shared'] = None
+        state['_stats'] = {kind: {HITS: 0, MISSES: 0} for kind in self._stats}
 
+        return state
 
-def add_element(element):
-    """Add the given element to cache
 
-    Args:
-        group (XsdElement): The XsdElement to add to cache
+class SharedComponents():
+    """Wrappers of components declared in included xsds, shared between the
+    caches of the schemas generated in a single run.
+
+    Wrappers are keyed by the namespace and url of the xsd declaring them, so
+    a registry should not outlive the run it was created for.
     """
-    element_cache[(element.name, element.type.name)] = Element(
-        element,
-        get_type(element.type.name)
-    )
+
+    def __init__(self):
+        self._components = {}
+        self._lock = threading.Lock()
+
+    def wrap(self, url, kind, key, component, wrapper, *args, **kwargs):
+        """Get the shared wrapper of the given component, creating it if
+        needed.
+
+        Components declared in the xsd of the cache wrapping them, or in the
+        xsd namespace itself, are not shared.
+
+        Args:
+            url (str|None): The url of the xsd of the cache wrapping the
+                component.
+            kind (str): One of GROUP, TYPE or ELEMENT.
+            key (mixed): The component's key.
+            component (XsdComponent): The component to wrap.
+            wrapper (type): The class to wrap the component with.
+            *args: Additional arguments for the wrapper.
+            **kwargs: Additional keyword arguments for the wrapper.
+
+        Returns:
+            Group|Type|Element: The wrapped component.
+        """
+        schema = component.schema
+        if (url is None
+                or schema.url is None
+                or schema.url == url
+                or schema.target_namespace == XSD_NAMESPACE):
+            return wrapper(component, *args, **kwargs)
+
+        with self._lock:
+            shared = self._components.setdefault(
+                (schema.target_namespace, schema.url), {})
+            wrapped = shared.get((kind, key))
+            if wrapped is None:
+                wrapped = wrapper(component, *args, **kwargs)
+                shared[(kind, key)] = wrapped
+
+        return wrapped
+
+    def clear(self):
+        """Forget every shared wrapper.
+        """
+        with self._lock:
+            self._components.clear()
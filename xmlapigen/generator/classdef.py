@@ -24,10 +24,111 @@ SOFTWARE.
 This module contains helpers for creating python class definitions for the
 generated doxyparser xsd library.
 """
+import os
 import re
+from ast import literal_eval
 from textwrap import dedent
 import inflect
-from .config import SIMPLE, BOOLS, COMPLEX, PLACEHOLDER, ANY, ENUMS
+from .config import SIMPLE, BOOLS, COMPLEX, PLACEHOLDER, ANY, ENUMS, GROUPS, TYPES, ELEMENTS, PLURALS
+
+# Creating an inflect engine is expensive so a single one is shared.
+_inflect_engine = None
+
+# Class styles: one decorator per accessor, a single @Schema decorator
+# holding the metadata table of the class, or plain methods and a literal
+# metadata table without any decorators.
+STYLE_DECORATORS = 'decorators'
+STYLE_SCHEMA = 'schema'
+STYLE_STATIC = 'static'
+STYLES = (STYLE_DECORATORS, STYLE_SCHEMA, STYLE_STATIC)
+
+# The class attribute holding the metadata of a generated class.
+META = '_meta'
+
+# Metadata table keys of each decorator's data.
+_TABLE_KEYS = {
+    'Attr': 'attributes',
+    'BoolAttr': 'attributes',
+    'Element': 'elements',
+    'Collection': 'collections',
+}
+
+# The order decorators install their accessors in; stacked decorators are
+# applied from the bottom up.
+_ACCESSOR_ORDER = {'Element': 0, 'Collection': 1, 'BoolAttr': 2, 'Attr': 3}
+
+# Module docstrings keyed by the header comment they are rendered from.
+_module_docs = {}
+
+# Plural collection keys keyed by enum value.
+_plurals = {}
+
+
+def get_plural(enum, plurals=None):
+    """Get the plural collection key for the given enum value.
+
+    Plurals are looked up in the given table first and memoized for the
+    lifetime of the process.
+
+    Args:
+        enum (str): The enum value.
+        plurals (dict, optional): A table of plurals keyed by enum value,
+            usually from the config. Defaults to None.
+
+    Returns:
+        str: The plural collection key.
+    """
+    global _inflect_engine
+
+    if plurals is not None and enum in plurals:
+        return plurals[enum]
+
+    plural = _plurals.get(enum)
+    if plural is None:
+        if _inflect_engine is None:
+            _inflect_engine = inflect.engine()
+        plural = _inflect_engine.plural(enum.replace('-', '_'))
+        _plurals[enum] = plural
+
+    return plural
+
+
+class Decorator():
+    """A class decorator of a generated class.
+
+    Decorators are kept as their name and rendered arguments so the import
+    they need is known without parsing the rendered decorator.
+    """
+
+    def __init__(self, name, *args):
+        """
+        Args:
+            name (str): The name of the decorator class.
+            *args (str): The source of each of the decorator's arguments.
+        """
+        self._name = name
+        self._args = args
+        self._rendered = None
+
+    def get_name(self):
+        return self._name
+
+    def get_args(self):
+        return self._args
+
+    def get_import(self):
+        """Get the import line of this decorator.
+
+        Returns:
+            str: The import line.
+        """
+        return f'from ....decorators.{self._name.lower()} import {self._name}'
+
+    def __str__(self):
+        if self._rendered is None:
+            self._rendered = f"@{self._name}({', '.join(self._args)})"
+
+        return self._rendered
 
 
 class ClassDef():
@@ -65,7 +166,8 @@ class ClassDef():
         self._name = name
         self._config = config
         self._definition = definition
-        self._import_lines = []
+        # Import lines in the order they were added; used as an ordered set.
+        self._import_lines = {}
         self._decorators = []
         self._doc = ''
         self._supers = []
@@ -73,10 +175,28 @@ class ClassDef():
         self._child_classes = []
         self._child_definitions = {}
         self._parent_class = None
+        self._style = STYLE_DECORATORS
 
     def get_decorators(self):
         return self._decorators
 
+    def set_style(self, style):
+        """Set the style the class is generated in.
+
+        Args:
+            style (str): One of STYLES.
+
+        Raises:
+            Exception: If the style is unknown.
+        """
+        if style not in STYLES:
+            raise Exception(f'Unknown class style {style}')
+
+        self._style = style
+
+    def get_style(self):
+        return self._style
+
     def add_header(self, add_header=True):
         self._add_header = add_header
 
@@ -115,13 +235,15 @@ class ClassDef():
             str: The indented string
         """
         lines = text.splitlines()
-        begin = initial_indent + lines.pop(0)
-        final_lines = []
-        for line in lines:
-            final_lines.append((subsequent_indent + line)
-                               if line.strip() else '')
+        fragments = [initial_indent + lines[0]]
+        fragments.extend(
+            (subsequent_indent + line) if line.strip() else ''
+            for line in lines[1:]
+        )
+        if len(lines) == 1:
+            fragments.append('')
 
-        return begin + "\n" + "\n".join(final_lines)
+        return "\n".join(fragments)
 
     def get_definition(self):
         """Get the definition of the element represented by this class.
@@ -179,19 +301,8 @@ class ClassDef():
         class uses.
         """
         cls = self.get_parent_or_self()
-        decorators = self.get_decorators()
-        seen = []
-        regex = r"@(.*)\("
-
-        for decorator in decorators:
-            matches = re.search(regex, decorator)
-            if matches:
-                match = matches.group(1)
-                if match not in seen:
-                    seen.append(match)
-
-        for decorator in seen:
-            cls.add_import(f'from ....decorators.{decorator.lower()} import {decorator}')
+        for decorator in self.get_class_decorators():
+            cls.add_import(decorator.get_import())
 
     @staticmethod
     def get_file_name(name):
@@ -211,8 +322,7 @@ class ClassDef():
         Args:
             import_line (str): An import line to add to this class.
         """
-        if import_line not in self._import_lines:
-            self._import_lines.append(import_line)
+        self._import_lines[import_line] = None
 
     def get_imports(self):
         """Get the imports this class definition has.
@@ -234,17 +344,264 @@ class ClassDef():
         """Add a class decorator.
 
         Args:
-            decorator (str): The decorator to add.
+            decorator (Decorator): The decorator to add.
         """
         self._decorators.append(decorator)
 
+    def get_class_decorators(self):
+        """Get the decorators the class is rendered with in its style.
+
+        Returns:
+            list: A list of Decorators.
+        """
+        if self._style == STYLE_SCHEMA and len(self._decorators) > 0:
+            return [Decorator('Schema', self.get_meta_table())]
+        if self._style == STYLE_STATIC:
+            return []
+
+        return self._decorators
+
     def get_sorted_decorators(self):
         """Get the final decorators output.
 
         Returns:
             str: A line separated string of storted decorator strings.
         """
-        return "\n".join(sorted(self._decorators))
+        return "\n".join(sorted(map(str, self.get_class_decorators())))
+
+    @staticmethod
+    def _reindent(text, indent):
+        """Indent every line but the first of the given text.
+
+        Args:
+            text (str): The text to indent.
+            indent (str): The string to place before the rest of the lines.
+
+        Returns:
+            str: The indented text.
+        """
+        return text.replace("\n", "\n" + indent)
+
+    def get_meta_table(self, supers=None):
+        """Get the source of the metadata table holding the data of every
+        decorator of this class.
+
+        Args:
+            supers (list, optional): The names of the classes whose metadata
+                is inherited. Their metadata is spread into the table so it
+                is merged the way the decorators merge it, without changing
+                the super classes' own metadata. Defaults to None.
+
+        Raises:
+            Exception: If we come across a decorator we haven't prepared for.
+
+        Returns:
+            str: The metadata table.
+        """
+        # The first super class wins, so it is spread last.
+        inherited = [
+            f"getattr({sup}, '{META}', {{}})"
+            for sup in reversed(supers or [])
+        ]
+        entries = [f"    **{meta}" for meta in inherited]
+        tables = {key: [] for key in _TABLE_KEYS.values()}
+        for decorator in sorted(self._decorators, key=str):
+            name = decorator.get_name()
+            args = decorator.get_args()
+            if name == 'Tag':
+                entries.append(f"    'tag': {args[0]}")
+            elif name == 'Placeholders':
+                entries.append(
+                    f"    'placeholders': {self._reindent(args[0], '    ')}")
+            elif name == 'Attr':
+                tables[_TABLE_KEYS[name]].append(f"{args[0]}: {{'type': {args[1]}}}")
+            elif name == 'BoolAttr':
+                tables[_TABLE_KEYS[name]].append(f"{args[0]}: {{'type': bool}}")
+            elif name == 'Element':
+                tables[_TABLE_KEYS[name]].append(f"{args[0]}: {{'type': {args[1]}}}")
+            elif name == 'Collection':
+                collectors = self._reindent(args[2], '        ')
+                tables[_TABLE_KEYS[name]].append(
+                    f"{args[0]}: {{'type': {args[1]}, 'collectors': {collectors}}}")
+            else:
+                raise Exception(f'Unknown decorator {name}')
+
+        for key in sorted(tables):
+            if len(tables[key]) > 0:
+                items = [f"**{meta}.get('{key}', {{}})" for meta in inherited]
+                items = ''.join(
+                    f"        {item},\n" for item in items + tables[key])
+                entries.append(f"    '{key}': {{\n{items}    }}")
+
+        return "{\n" + ",\n".join(entries) + ",\n}"
+
+    @staticmethod
+    def _get_method(fn_name, doc, body):
+        """Get the source of a method of a static class.
+
+        Args:
+            fn_name (str): The name of the method.
+            doc (str): The method's documentation, including any trailing
+                whitespace before the closing quotes.
+            body (str): The method's return expression.
+
+        Returns:
+            str: The method.
+        """
+        return (
+            f"    def {fn_name}(self):\n"
+            f'        """{doc}"""\n'
+            f"        return {body}"
+        )
+
+    @staticmethod
+    def _get_type_doc(node_type):
+        """Get the way the decorators document the given type argument.
+
+        Args:
+            node_type (str): The source of the type argument.
+
+        Returns:
+            str: The type as the decorators format it.
+        """
+        # Builtin types are passed as classes, anything else as literals.
+        if node_type.isidentifier():
+            return f"<class '{node_type}'>"
+
+        value = literal_eval(node_type)
+        return value if isinstance(value, str) else str(value)
+
+    def _get_static_methods(self):
+        """Get the accessor methods of a class rendered in the static style.
+
+        Accessors are collected in the order the decorators would install
+        them, so a later accessor replaces an earlier one of the same name.
+        Their documentation matches what the decorators generate, except the
+        classes returned by collections are named relative to the generated
+        package since its own name is not known here.
+
+        Returns:
+            dict: The documentation and return expression of each method,
+                keyed by method name.
+        """
+        methods = {}
+        accessors = sorted(
+            (d for d in self._decorators if d.get_name() in _ACCESSOR_ORDER),
+            key=lambda d: (_ACCESSOR_ORDER[d.get_name()], str(d))
+        )
+        for decorator in accessors:
+            name = decorator.get_name()
+            args = decorator.get_args()
+            if name in ('Attr', 'BoolAttr'):
+                attr_name = literal_eval(args[0])
+                attr_type = args[1] if name == 'Attr' else 'bool'
+                methods[f'get_{attr_name}'] = (
+                    f"Return {attr_name} attribute value\n\n"
+                    f"        Returns:\n"
+                    f"            {self._get_type_doc(attr_type)}\n        ",
+                    f"self.get_attr({args[0]}, {attr_type})"
+                )
+            elif name == 'Element':
+                tag_name = literal_eval(args[0])
+                node_type = self._get_type_doc(args[1])
+                methods[f'get_{tag_name}'] = (
+                    f"Return child {tag_name} element\n\n"
+                    f"        Returns:\n"
+                    f"            {node_type}: The model representing the {tag_name}.\n        ",
+                    f"self.get_child({args[0]}, {args[1]})"
+                )
+            elif name == 'Collection':
+                tag_name = literal_eval(args[0])
+                node_type = literal_eval(args[1])
+                xsd = os.path.basename(self.get_config().get_xsd()).split('.')[0]
+                returns = (
+                    f"\n\n        Returns:\n"
+                    f"            list(xsd.{xsd}.types.{self.get_file_name(node_type)}"
+                    f".{self.get_class_name(node_type)}): "
+                    f"A list of {tag_name} elements found."
+                )
+                methods[f'get_{tag_name}s'] = (
+                    f"Return child {tag_name} elements" + returns + "\n        ",
+                    "self.get_collection(self.tag_name, None)"
+                )
+                for pattern, xpath_args in literal_eval(args[2]).items():
+                    for method_tail, pattern_arg in xpath_args.items():
+                        methods[f'get_{tag_name}_{method_tail}'] = (
+                            f"Return child {tag_name} elements matching "
+                            f"xpath '{tag_name}/{pattern.format(pattern_arg)}'"
+                            + returns,
+                            f"self.get_collection(self.tag_name, "
+                            f"[{pattern!r}, {pattern_arg!r}])"
+                        )
+
+        return methods
+
+    def _get_static_names(self):
+        """Get the names the static accessor methods are defined under.
+
+        Enum values such as C# don't make valid method names. Those methods
+        are defined under a private name and moved to their real name once
+        the class exists, see get_static_aliases().
+
+        Returns:
+            dict: The name each method is defined under, keyed by its real
+                name.
+        """
+        names = {}
+        for fn_name in sorted(self._get_static_methods()):
+            if fn_name.isidentifier():
+                names[fn_name] = fn_name
+                continue
+
+            valid_name = '_' + re.sub(r'\W', '_', fn_name)
+            # Different values may map to the same valid name.
+            unique_name = valid_name
+            count = 1
+            while unique_name in names.values():
+                count += 1
+                unique_name = f'{valid_name}_{count}'
+            names[fn_name] = unique_name
+
+        return names
+
+    def get_static_members(self):
+        """Get the source of the metadata and accessor methods of a class
+        rendered in the static style.
+
+        Returns:
+            list: The class members.
+        """
+        if self._style != STYLE_STATIC or len(self._decorators) == 0:
+            return []
+
+        table = self.get_meta_table(self._supers)
+        members = [f"    {META} = {self._reindent(table, '    ')}"]
+        methods = self._get_static_methods()
+        for fn_name, defined_name in self._get_static_names().items():
+            members.append(self._get_method(defined_name, *methods[fn_name]))
+
+        return members
+
+    def get_static_aliases(self):
+        """Get the statements moving the static accessor methods which aren't
+        valid identifiers to their real names after the class is defined.
+
+        Returns:
+            list: The statements.
+        """
+        if self._style != STYLE_STATIC or len(self._decorators) == 0:
+            return []
+
+        class_name = self.get_class_name(self._name)
+        aliases = []
+        for fn_name, defined_name in self._get_static_names().items():
+            if fn_name != defined_name:
+                aliases.append(
+                    f"setattr({class_name}, {fn_name!r}, {class_name}.{defined_name})\n"
+                    f"delattr({class_name}, {defined_name!r})"
+                )
+
+        return aliases
 
     def set_class_doc(self, doc):
         """Set the documentation the class should use.
@@ -260,10 +617,18 @@ class ClassDef():
         Returns:
             str: The documentation
         """
-        if self._add_header:
-            return self.indent('"""' + dedent(self.HEAD_COMMENT) + "\n" + '"""') + "\n"
+        if not self._add_header:
+            return ''
 
-        return ''
+        # The header never changes so it is only dedented and indented once.
+        module_doc = _module_docs.get(self.HEAD_COMMENT)
+        if module_doc is None:
+            module_doc = self.indent(
+                '"""' + dedent(self.HEAD_COMMENT) + "\n" + '"""'
+            ) + "\n"
+            _module_docs[self.HEAD_COMMENT] = module_doc
+
+        return module_doc
 
     def get_class_doc(self):
         """Get the documentation the class should use.
@@ -316,19 +681,30 @@ class ClassDef():
         imports = self.get_imports()
         decorators = self.get_sorted_decorators()
         class_doc = self.get_class_doc()
-        child_classes = "\n\n\n".join(self._child_classes)
-
-        out = (mod_doc + "\n") if mod_doc != '' else ''
-        out += (imports + "\n\n") if imports != '' else ''
-        out += (decorators + "\n") if decorators != '' else ''
-        out += f"class {self.get_class_name(self._name)}({self.get_extends()}):\n"
-        out += (class_doc) if class_doc != '' else ''
-        out += ("\n\n\n" + child_classes) if child_classes != '' else ''
+
+        fragments = []
+        if mod_doc != '':
+            fragments += [mod_doc, "\n"]
+        if imports != '':
+            fragments += [imports, "\n\n"]
+        if decorators != '':
+            fragments += [decorators, "\n"]
+        fragments.append(
+            f"class {self.get_class_name(self._name)}({self.get_extends()}):\n"
+        )
+        fragments.append(class_doc)
+        for member in self.get_static_members():
+            fragments += ["\n\n", member]
+        aliases = self.get_static_aliases()
+        if len(aliases) > 0:
+            fragments += ["\n\n\n", "\n".join(aliases)]
+        for child_class in self._child_classes:
+            fragments += ["\n\n\n", child_class]
         # final new line
         if self.get_parent_class() is None:
-            out += "\n"
+            fragments.append("\n")
 
-        return out
+        return ''.join(fragments)
 
     def add_attributes_to_class(self, attributes):
         """Add the given attributes to the decorators for this class.
@@ -339,15 +715,19 @@ class ClassDef():
         for category, category_config in attributes.items():
             for attr_name in category_config:
                 if category in [SIMPLE, ENUMS]:
-                    self.add_decorator(f"@Attr('{attr_name}', {category_config[attr_name]})")
+                    self.add_decorator(Decorator(
+                        'Attr',
+                        f"'{attr_name}'",
+                        str(category_config[attr_name])
+                    ))
                 elif category == BOOLS:
-                    self.add_decorator(f"@BoolAttr('{attr_name}')")
+                    self.add_decorator(Decorator('BoolAttr', f"'{attr_name}'"))
 
     def _add_element_decorator(self, element_name, element_type):
         if element_type not in ('str', 'int', 'float'):
             element_type = f"'{element_type}'"
         self.add_decorator(
-            f"@Element('{element_name}', {element_type})")
+            Decorator('Element', f"'{element_name}'", element_type))
 
 
     def add_elements_to_class(self, elements):
@@ -371,11 +751,10 @@ class ClassDef():
                     self._add_element_decorator(elem_name, category)
             elif category == PLACEHOLDER:
                 if len(category_config) > 0:
-                    decorator = "@Placeholders([\n"
-                    decorator += ",\n".join(
+                    placeholders = ",\n".join(
                         [f"    '{p}'" for p in category_config])
-                    decorator += "\n])"
-                    self.add_decorator(decorator)
+                    self.add_decorator(
+                        Decorator('Placeholders', f"[\n{placeholders}\n]"))
             else:
                 for elem_name, type_name in category_config.items():
                     if category == COMPLEX:
@@ -397,31 +776,36 @@ class ClassDef():
             elem_name (str): The name of the element
             type_name (str): The name of its type.
         """
-        enum_attrs = self.get_config().get_type_enum_attributes(type_name)
-        collection = f"@Collection('{elem_name}', '{type_name}', {{\n"
+        config = self.get_config()
+        enum_attrs = config.get_type_enum_attributes(type_name)
+        plurals = config.get_plurals()
         filters = []
-        for attr, enums in enum_attrs.items():
-            item = f"    '[@{attr}=\"{{}}\"]': {{\n"
-            for enum in enums:
-                plural_key = inflect.engine().plural(enum.replace('-', '_'))
-                item += f"        '{plural_key}': '{enum}',\n"
-            item += "    }"
-            filters.append(item)
-        collection += ",\n".join(filters) + "\n"
-
-        collection += "})"
-
-        self.add_decorator(collection)
+        for attr, enums in sorted(enum_attrs.items()):
+            item = [f"    '[@{attr}=\"{{}}\"]': {{\n"]
+            item.extend(
+                f"        '{get_plural(enum, plurals)}': '{enum}',\n"
+                for enum in enums
+            )
+            item.append("    }")
+            filters.append(''.join(item))
+
+        self.add_decorator(Decorator(
+            'Collection',
+            f"'{elem_name}'",
+            f"'{type_name}'",
+            ''.join(["{\n", ",\n".join(filters), "\n}"])
+        ))
 
     def add_complex_element_child_classes(self, complex_elements):
-        for element_name, element_type in complex_elements:
+        for element_name, element_type in sorted(complex_elements):
             self.add_child_class(str(element_factory(
                 element_name,
                 element_type,
                 self.get_child_definition(element_name),
                 self._config,
                 add_header=False,
-                parent_class=self
+                parent_class=self,
+                style=self.get_style()
             )))
 
 class TypeClassDef(ClassDef):
@@ -458,9 +842,8 @@ class ElementClassDef(ClassDef):
 
     def build(self):
         element_name = self.get_name()
-        self.add_decorator(f'@Tag(\'{element_name}\')')
+        self.add_decorator(Decorator('Tag', f"'{element_name}'"))
         self.determine_extends('types', [self.get_type(element_name)])
-        self.determine_decorator_include()
         doc = f'Model representation of a doxygen {element_name} element.' + "\n\n"
         doc += "Type XSD:\n\n"
         doc += self.get_definition()
@@ -496,22 +879,97 @@ class GroupClassDef(ClassDef):
         complex_elements = config.get_group_elements(group_name).get(COMPLEX, {}).items()
         self.add_complex_element_child_classes(complex_elements)
 
-def group_factory(group_name, config, definition, element_definitions):
+def group_factory(group_name, config, definition, element_definitions, style=STYLE_DECORATORS):
     group_class = GroupClassDef(group_name, config, definition)
     group_class.add_child_definitions(element_definitions)
+    group_class.set_style(style)
 
     return group_class
 
-def type_factory(type_name, config, definition, element_definitions):
+def type_factory(type_name, config, definition, element_definitions, style=STYLE_DECORATORS):
     type_class = TypeClassDef(type_name, config, definition)
     type_class.add_child_definitions(element_definitions)
+    type_class.set_style(style)
 
     return type_class
 
-def element_factory(element_name, element_type, definition, config, add_header=True, parent_class=None):
+def element_factory(element_name, element_type, definition, config, add_header=True, parent_class=None, style=STYLE_DECORATORS):
     element_class = ElementClassDef(element_name, config, definition)
     element_class.set_type(element_type)
     element_class.add_header(add_header)
     element_class.set_parent_class(parent_class)
+    element_class.set_style(style)
 
     return element_class
+
+def render_class(config, kind, name, *args, style=STYLE_DECORATORS):
+    """Render the class definition of the given kind.
+
+    Args:
+        config (Config): The config with the class' xsd set.
+        kind (str): One of GROUPS, TYPES or ELEMENTS.
+        name (str): The name of the group, type or element.
+        args (mixed): The remaining arguments of the kind's factory. The
+            definition and element definitions for groups and types; the
+            element type and definition for elements.
+        style (str, optional): One of STYLES. Defaults to STYLE_DECORATORS.
+
+    Raises:
+        Exception: If the kind is unknown.
+
+    Returns:
+        str: The final representation of the class.
+    """
+    if kind == GROUPS:
+        class_def = group_factory(name, config, *args, style=style)
+    elif kind == TYPES:
+        class_def = type_factory(name, config, *args, style=style)
+    elif kind == ELEMENTS:
+        element_type, definition = args
+        class_def = element_factory(
+            name, element_type, definition, config, style=style)
+    else:
+        raise Exception(f'Unknown class kind {kind}')
+
+    return str(class_def)
+
+
+def render_inputs(config, kind, name, *args):
+    """Get the configuration data the class definition of the given kind is
+    rendered from.
+
+    Together with the render arguments this is everything which determines
+    the rendered class.
+
+    Args:
+        config (Config): The config with the class' xsd set.
+        kind (str): One of GROUPS, TYPES or ELEMENTS.
+        name (str): The name of the group, type or element.
+        args (mixed): The remaining arguments of the kind's factory.
+
+    Returns:
+        dict: The configuration data used to render the class.
+    """
+    if kind == GROUPS:
+        item = config.get_group_config(name)
+        elements = config.get_group_elements(name)
+    elif kind == TYPES:
+        item = config.get_type_config(name)
+        elements = config.get_type_elements(name)
+    else:
+        item = args[0]
+        elements = {}
+
+    # Complex children become collections when their type has enum
+    # attributes so those attributes, and the plurals their values are
+    # collected under, are part of our input as well.
+    enums = {}
+    plurals = {}
+    config_plurals = config.get_plurals()
+    for type_name in elements.get(COMPLEX, {}).values():
+        enums[type_name] = config.get_type_enum_attributes(type_name)
+        for values in enums[type_name].values():
+            for enum in values:
+                plurals[enum] = get_plural(enum, config_plurals)
+
+    return {kind: item, ENUMS: enums, PLURALS: plurals}
@@ -21,13 +21,29 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
+import json
 import pathlib
 from yaml import load, dump
+from . import files
 
 try:
-    from yaml import CLoader as Loader
+    from yaml import CLoader as Loader, CDumper as Dumper
 except ImportError:
-    from yaml import Loader
+    from yaml import Loader, Dumper
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+YAML = 'yaml'
+JSON = 'json'
+MSGPACK = 'msgpack'
+FORMATS = {
+    '.json': JSON,
+    '.msgpack': MSGPACK,
+    '.mpk': MSGPACK,
+}
 
 EXT = '.xsd'
 XSD = 'xsd'
@@ -43,6 +59,78 @@ SIMPLE = 'simple'
 COMPLEX = 'complex'
 TYPE = 'type'
 ENUMS = 'enums'
+SHARDS = 'shards'
+PLURALS = 'plurals'
+
+
+class FrozenDict(dict):
+    """A dict which can not be changed once created.
+    """
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('Frozen configuration can not be changed!')
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """A list which can not be changed once created.
+    """
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('Frozen configuration can not be changed!')
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = remove = pop = clear = _immutable
+    sort = reverse = _immutable
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def _freeze(data):
+    """Get a frozen copy of the given configuration data.
+
+    Args:
+        data (mixed): The data to freeze.
+
+    Returns:
+        mixed: The data with every dict and list replaced by a FrozenDict or
+            FrozenList.
+    """
+    if isinstance(data, dict):
+        return FrozenDict({key: _freeze(value) for key, value in data.items()})
+    if isinstance(data, list):
+        return FrozenList([_freeze(value) for value in data])
+
+    return data
+
+
+def _index_types(types):
+    """Index the given type configuration by type name.
+
+    Args:
+        types (dict): Type configuration keyed by type name.
+
+    Returns:
+        dict: The ATTRIBUTES, ENUMS, ELEMENTS and GROUPS data of each type
+            keyed by type name.
+    """
+    index = {}
+    for name, type_config in types.items():
+        attributes = type_config.get(ATTRIBUTES, {})
+        index[name] = {
+            ATTRIBUTES: attributes,
+            ENUMS: attributes.get(ENUMS, {}),
+            ELEMENTS: type_config.get(ELEMENTS, {}),
+            GROUPS: type_config.get(GROUPS, []),
+        }
+
+    return index
 
 
 class Config():
@@ -50,57 +138,290 @@ class Config():
     xsd-based classes.
     """
 
-    def __init__(self, path):
+    def __init__(self, path, sharded=False):
+        """
+        Args:
+            path (str|None): The configuration file path. None keeps the
+                configuration in memory only.
+            sharded (bool, optional): Whether or not to store each xsd's
+                configuration in its own file next to an index file at the
+                given path. Configuration files which are already sharded
+                are always kept that way. Defaults to False.
+        """
         self._path = path
         self._config = None
         self._xsd = path
+        self._sharded = sharded
+        self._shards = {}
+        self._index = None
+        self._layout_changed = False
 
     def set_xsd(self, xsd):
         """Set the xsd name the config is to work with.
 
+        When sharded, the xsd's configuration file is loaded the first time
+        the xsd is set.
+
         Args:
             xsd (str): The name of the source xsd file without the extension.
         """
         self._xsd = xsd
+        self._index = None
+        self._load_shard(xsd)
         self._provide(self.get_config(), xsd, {})
 
+    def is_sharded(self):
+        """Determine whether or not each xsd's configuration is stored in its
+        own file.
+
+        Returns:
+            bool
+        """
+        self.load()
+        return self._sharded
+
     def get_xsd(self):
         return self._xsd
 
+    def get_path(self):
+        """Get the path of the configuration file.
+
+        Returns:
+            str: The configuration file path.
+        """
+        return self._path
+
     def clear_xsd(self):
+        self._index = None
         self.get_config()[self._xsd] = {}
 
+    def set_xsd_config(self, xsd_config):
+        """Replace the configuration for the current xsd.
+
+        Args:
+            xsd_config (dict): The data for the current xsd.
+        """
+        self._index = None
+        self.get_config()[self._xsd] = xsd_config
+
+    def merge_xsd_config(self, xsd_config):
+        """Merge the given configuration into the configuration of the
+        current xsd.
+
+        Group, type and element entries are only replaced when they differ
+        from the given ones and entries which are no longer given are
+        removed. Any other data in the current xsd's configuration is left
+        alone.
+
+        Args:
+            xsd_config (dict): The newly generated data for the current xsd.
+
+        Returns:
+            bool: True if the configuration changed, False otherwise.
+        """
+        self._index = None
+        current = self.get_xsd_config()
+        changed = False
+
+        for category in (GROUPS, TYPES, ELEMENTS):
+            entries = xsd_config.get(category, {})
+            if len(entries) == 0:
+                if category in current:
+                    del current[category]
+                    changed = True
+                continue
+
+            existing = self._provide(current, category, {})[category]
+            for name in existing.keys() - entries.keys():
+                del existing[name]
+                changed = True
+
+            for name, entry in entries.items():
+                if name not in existing or existing[name] != entry:
+                    existing[name] = entry
+                    changed = True
+
+        return changed
+
+    def exists(self):
+        """Determine whether or not the configuration file exists.
+
+        Returns:
+            bool: True if the configuration file exists, False otherwise.
+        """
+        return self._path is not None and pathlib.Path(self._path).exists()
+
+    def get_format(self):
+        """Get the format of the configuration file based on its extension.
+
+        Configuration files ending in .json are stored as JSON, those ending
+        in .msgpack or .mpk as msgpack and all others as YAML.
+
+        Returns:
+            str: One of YAML, JSON or MSGPACK.
+        """
+        if self._path is None:
+            return YAML
+
+        return FORMATS.get(pathlib.Path(self._path).suffix.lower(), YAML)
+
     def load(self):
         """Load the configuration found at the given path.
 
+        A config without a path starts empty and is only kept in memory. The
+        xsd configuration files of a sharded config are not read until their
+        xsd is set.
+
         Returns:
             self
         """
         if self._config is None:
             # Load the current configuration
-            if pathlib.Path(self._path).exists():
-                config_file = open(self._path, 'r')
-                self._config = load(config_file, Loader=Loader)
-                config_file.close()
+            if self.exists():
+                self._config = self._read(self._path, self.get_format())
 
             self._config = {} if self._config is None else self._config
 
+            if SHARDS in self._config:
+                self._sharded = True
+                self._shards = self._config.pop(SHARDS)
+            elif self._sharded and self.exists():
+                # An unsharded file is converted the next time it is saved.
+                self._layout_changed = True
+
         return self
 
+    def is_layout_changed(self):
+        """Determine whether or not the configuration would be stored in a
+        different layout than the one on disk, such as when sharding an
+        existing unsharded configuration file.
+
+        Returns:
+            bool: True if the configuration needs saving to switch layouts.
+        """
+        self.load()
+        return self._layout_changed
+
     def save(self):
         """Save the configuration data to the configuration file.
 
+        When sharded, each loaded xsd configuration is saved to its own file
+        and the configuration file only lists these files.
+
         Returns:
             self
         """
-        header = "#This file was autogenerated. See config_generator.py\n"
-        config_file = open(self._path, 'w+')
-        config_file.write(header)
-        dump(self._config, config_file)
-        config_file.close()
+        config_format = self.get_format()
+        if not self._sharded:
+            files.write(self._path, self._serialize(self._config, config_format))
+            return self
+
+        index = dict(self._config)
+        for xsd, xsd_config in index.pop(XSD, {}).items():
+            shard_path = self._get_shard_path(xsd)
+            files.write(shard_path, self._serialize(xsd_config, config_format))
+
+        index[SHARDS] = self._shards
+        files.write(self._path, self._serialize(index, config_format))
+        self._layout_changed = False
 
         return self
 
+    def _get_shard_path(self, xsd):
+        """Get the path of the configuration file of the given xsd, naming a
+        new one if necessary.
+
+        Args:
+            xsd (str): The xsd file path.
+
+        Returns:
+            str: The xsd's configuration file path.
+        """
+        path = pathlib.Path(self._path)
+        if xsd not in self._shards:
+            stem = path.stem + '.' + pathlib.Path(xsd).stem
+            name = stem + path.suffix
+            count = 1
+            while name in self._shards.values():
+                count += 1
+                name = f'{stem}{count}{path.suffix}'
+            self._shards[xsd] = name
+
+        return str(path.parent / self._shards[xsd])
+
+    def _load_shard(self, xsd):
+        """Load the configuration file of the given xsd if the config is
+        sharded and it has not been loaded yet.
+
+        Args:
+            xsd (str): The xsd file path.
+        """
+        self.load()
+        config = self._provide(self._config, XSD, {})[XSD]
+        if xsd in config or xsd not in self._shards:
+            return
+
+        shard_path = self._get_shard_path(xsd)
+        xsd_config = None
+        if pathlib.Path(shard_path).exists():
+            xsd_config = self._read(shard_path, self.get_format())
+
+        config[xsd] = {} if xsd_config is None else xsd_config
+
+    @staticmethod
+    def _require_msgpack():
+        """Make sure msgpack is available.
+
+        Raises:
+            Exception: If msgpack is not installed.
+        """
+        if msgpack is None:
+            raise Exception(
+                'msgpack must be installed to use msgpack configuration files!')
+
+    @classmethod
+    def _read(cls, path, config_format):
+        """Read configuration data from the file at the given path.
+
+        Args:
+            path (str): The configuration file path.
+            config_format (str): One of YAML, JSON or MSGPACK.
+
+        Returns:
+            dict|None: The configuration data.
+        """
+        if config_format == MSGPACK:
+            cls._require_msgpack()
+            with open(path, 'rb') as config_file:
+                return msgpack.unpackb(config_file.read(), raw=False)
+
+        with open(path, 'r') as config_file:
+            if config_format == JSON:
+                return json.load(config_file)
+
+            return load(config_file, Loader=Loader)
+
+    @classmethod
+    def _serialize(cls, data, config_format):
+        """Serialize the given configuration data.
+
+        Args:
+            data (dict): The configuration data.
+            config_format (str): One of YAML, JSON or MSGPACK.
+
+        Returns:
+            str|bytes: The serialized configuration.
+        """
+        if config_format == MSGPACK:
+            cls._require_msgpack()
+            return msgpack.packb(data, use_bin_type=True)
+
+        if config_format == JSON:
+            return json.dumps(data, indent=2, sort_keys=True) + "\n"
+
+        header = "#This file was autogenerated. See config_generator.py\n"
+        return header + dump(data, Dumper=Dumper)
+
     @staticmethod
     def _provide(data, key, default):
         """Provide the given data dictionary with a default value for the
@@ -138,6 +459,7 @@ class Config():
         Returns:
             mixed: the given value
         """
+        self._index = None
         path_parts = list(path_parts)
         config = self.get_xsd_config()
         cur_config = config
@@ -177,19 +499,33 @@ class Config():
             dict: the data for the current xsd
         """
         key = self._xsd
+        self._load_shard(key)
         config = self.get_config()
 
         self._provide(config, key, {})
 
         return config[key]
 
+    def get_plurals(self):
+        """Get the table of plural collection keys shared by all xsd files.
+
+        Returns:
+            dict: Plural collection keys keyed by enum value.
+        """
+        self.load()
+        return self._provide(self._config, PLURALS, {})[PLURALS]
+
     def get_xsd_files(self):
         """Get a list of xsd file names our config file knows about.
 
         Returns:
             list: The list of xsd files our config knows about.
         """
-        return self.get_config(False).keys()
+        xsd_files = self.get_config(False).keys()
+        if not self._sharded:
+            return xsd_files
+
+        return list(dict.fromkeys([*self._shards, *xsd_files]))
 
     def get_types(self):
         """Get the TYPES for the current xsd.
@@ -237,6 +573,47 @@ class Config():
         """
         return self.get_types().get(type_name)
 
+    def _get_type_index(self, type_name):
+        """Get the indexed data of the type with the given name.
+
+        The index of the current xsd's types is built on first use and
+        dropped whenever the xsd or its configuration changes.
+
+        Args:
+            type_name (str): The type's name
+
+        Raises:
+            AttributeError: If the type is unknown.
+
+        Returns:
+            dict: The type's ATTRIBUTES, ENUMS, ELEMENTS and GROUPS data.
+        """
+        if self._index is None:
+            self._index = _index_types(self.get_types())
+
+        type_index = self._index.get(type_name)
+        if type_index is None:
+            raise AttributeError(f'Unable to find type with name {type_name}')
+
+        return type_index
+
+    def freeze(self):
+        """Get a read-only snapshot of the configuration of the current xsd.
+
+        The snapshot answers the same queries as this config without any of
+        the loading and provisioning checks, and can be shared between
+        threads or pickled for worker processes.
+
+        Returns:
+            FrozenConfig: The snapshot.
+        """
+        return FrozenConfig(
+            self.get_path(),
+            self.get_xsd(),
+            self.get_xsd_config(),
+            self.get_plurals()
+        )
+
     def get_group_config(self, group_name):
         """Get the group configuration for the group with the given name.
 
@@ -270,7 +647,7 @@ class Config():
         Returns:
             list: A list of child group names
         """
-        return self.get_type_config(type_name).get(GROUPS, [])
+        return self._get_type_index(type_name)[GROUPS]
 
     def get_type_attributes(self, type_name):
         """Return attribute data for the type with the given name.
@@ -281,7 +658,7 @@ class Config():
         Returns:
             dict: Attribute data for the given type name.
         """
-        return self.get_type_config(type_name).get(ATTRIBUTES, {})
+        return self._get_type_index(type_name)[ATTRIBUTES]
 
     def get_type_elements(self, type_name):
         """Return element data for the type with the given name.
@@ -292,7 +669,7 @@ class Config():
         Returns:
             dict: Element data for the given type name.
         """
-        return self.get_type_config(type_name).get(ELEMENTS, {})
+        return self._get_type_index(type_name)[ELEMENTS]
 
 
     def get_group_elements(self, group_name):
@@ -328,7 +705,7 @@ class Config():
             bool: True if the type has attributes with enum data. False
                 otherwise.
         """
-        return ENUMS in self.get_type_attributes(type_name).keys()
+        return ENUMS in self._get_type_index(type_name)[ATTRIBUTES]
 
     def get_type_enum_attributes(self, type_name):
         """Get the list of attributes of this type which have enum data.
@@ -340,7 +717,7 @@ class Config():
         Returns:
             dict: A dictionary of attribute name keys with enum list values.
         """
-        return self.get_type_attributes(type_name).get(ENUMS, {})
+        return self._get_type_index(type_name)[ENUMS]
 
     def add_group_config(self, name, group):
         """Add group configuration to the xsd config
@@ -488,3 +865,75 @@ class Config():
             type_name (str): The type of the element
         """
         self.set_path(type_name, ELEMENTS, name)
+
+
+class FrozenConfig(Config):
+    """Read-only snapshot of the configuration of a single xsd.
+
+    Every query is served from data prepared when the snapshot is created.
+    Anything which would change the configuration raises a TypeError.
+    """
+
+    def __init__(self, path, xsd, xsd_config, plurals):
+        """
+        Args:
+            path (str|None): The path of the configuration file the snapshot
+                was taken from.
+            xsd (str): The xsd file path.
+            xsd_config (dict): The configuration of the xsd.
+            plurals (dict): The plural table of the configuration.
+        """
+        super().__init__(path)
+        self._xsd = xsd
+        xsd_config = _freeze(xsd_config)
+        self._config = FrozenDict({XSD: FrozenDict({xsd: xsd_config})})
+        self._xsd_config = xsd_config
+        self._types = xsd_config.get(TYPES, FrozenDict())
+        self._groups = xsd_config.get(GROUPS, FrozenDict())
+        self._elements = xsd_config.get(ELEMENTS, FrozenDict())
+        self._plurals = _freeze(plurals)
+        self._index = _freeze(_index_types(self._types))
+
+    def set_xsd(self, xsd):
+        if xsd != self._xsd:
+            raise TypeError('Frozen configuration can not change its xsd!')
+
+    def load(self):
+        return self
+
+    def save(self):
+        raise TypeError('Frozen configuration can not be saved!')
+
+    def freeze(self):
+        return self
+
+    def is_sharded(self):
+        return False
+
+    def get_config(self, require_xsd=True):
+        return self._config[XSD]
+
+    def get_xsd_config(self):
+        return self._xsd_config
+
+    def get_xsd_files(self):
+        return [self._xsd]
+
+    def get_plurals(self):
+        return self._plurals
+
+    def get_types(self):
+        return self._types
+
+    def get_groups(self):
+        return self._groups
+
+    def get_elements(self):
+        return self._elements
+
+    def _get_type_index(self, type_name):
+        type_index = self._index.get(type_name)
+        if type_index is None:
+            raise AttributeError(f'Unable to find type with name {type_name}')
+
+        return type_index
@@ -0,0 +1,82 @@
+"""
+MIT License
+
+Copyright (c) 2020 Collin Brooks
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+
+This module contains helpers for writing generated files.
+"""
+import os
+import threading
+
+
+def is_unchanged(path, data):
+    """Determine whether or not the file at the given path already holds the
+    given data.
+
+    The file's size is checked before its contents are read.
+
+    Args:
+        path (str): The file path.
+        data (bytes): The data to compare against.
+
+    Returns:
+        bool: True if the file exists with identical contents.
+    """
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, 'rb') as existing:
+            return existing.read() == data
+    except OSError:
+        return False
+
+
+def write(path, content):
+    """Write the content to the file at the given path.
+
+    Files which already hold the content are left untouched so their
+    modification times are preserved. Otherwise the content is written to a
+    temporary file next to the target which then replaces the target, so a
+    crash never leaves a partially written file behind.
+
+    Args:
+        path (str): The location where we should write the content.
+        content (str|bytes): The content to write.
+
+    Returns:
+        bool: True if the file was written, False if it was unchanged.
+    """
+    data = content.encode() if isinstance(content, str) else content
+    if is_unchanged(path, data):
+        return False
+
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return True
@@ -0,0 +1,67 @@
+"""
+MIT License
+
+Copyright (c) 2020 Collin Brooks
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+
+This module contains helpers for spreading generation work across processes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+
+def map_jobs(func, items, jobs=1, initializer=None, initargs=()):
+    """Apply the given function to each of the given items.
+
+    When more than one job is requested, the items are handed to a pool of
+    worker processes. Workers do not share any state with the caller, such
+    as loaded schemas or their caches, so the function must not rely on
+    state set up by the caller.
+
+    Args:
+        func (callable): A module level function taking a single item.
+        items (list): The items to process. Items must be picklable when
+            more than one job is requested.
+        jobs (int, optional): The number of worker processes to use.
+            Defaults to 1.
+        initializer (callable, optional): A module level function called
+            once in each worker process before any items are processed.
+            It is called in this process when the items are processed
+            serially. Defaults to None.
+        initargs (tuple, optional): The arguments for the initializer.
+
+    Returns:
+        list: The results of the function, in the order of the given items.
+    """
+    items = list(items)
+    if jobs is None or jobs <= 1 or len(items) <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [func(item) for item in items]
+
+    workers = min(jobs, len(items))
+    # Hand out items in batches so small items do not drown in overhead.
+    chunksize = max(1, len(items) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=initializer,
+        initargs=initargs
+    ) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
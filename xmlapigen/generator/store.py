@@ -0,0 +1,197 @@
+"""
+MIT License
+
+Copyright (c) 2020 Collin Brooks
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+
+This module contains helpers for persisting compiled schemas to disk so
+unchanged xsd files do not have to be parsed and built on every run.
+"""
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+import xmlschema
+
+EXT = '.pickle'
+SCHEMA = 'schema'
+COMPONENTS = 'components'
+DEPENDENCIES = 'dependencies'
+
+
+def file_digest(path):
+    """Get the sha256 digest of the contents of the file at the given path.
+
+    Args:
+        path (str): The file to hash.
+
+    Returns:
+        str: The hex digest of the file's contents.
+    """
+    return hashlib.sha256(pathlib.Path(path).read_bytes()).hexdigest()
+
+
+def source_digest(*modules):
+    """Get a digest of the source code of the given modules.
+
+    Pickled data is only valid for the code which created it so we key our
+    entries on the source of the modules whose objects we store.
+
+    Args:
+        modules (module): The modules to hash.
+
+    Returns:
+        str: The hex digest of the modules' source.
+    """
+    digest = hashlib.sha256()
+    for module in modules:
+        digest.update(pathlib.Path(module.__file__).read_bytes())
+
+    return digest.hexdigest()
+
+
+def get_key(path):
+    """Get the cache key for the xsd file at the given path.
+
+    The key covers the xsd's absolute path and bytes, the installed
+    xmlschema version and the code of the cache, types, walker and config
+    modules whose wrappers and indexes we pickle alongside the schema.
+    Included and imported xsd files are resolved relative to the xsd, so
+    copies at different paths get their own entries, and are checked when
+    the entry is loaded.
+
+    Args:
+        path (str): The xsd file path.
+
+    Returns:
+        str: The cache key.
+    """
+    from . import cache, config, types, walker
+
+    digest = hashlib.sha256()
+    digest.update(xmlschema.__version__.encode())
+    digest.update(source_digest(cache, config, types, walker).encode())
+    digest.update(os.path.realpath(path).encode())
+    digest.update(pathlib.Path(path).read_bytes())
+
+    return digest.hexdigest()
+
+
+def get_dependencies(schema):
+    """Get the digests of every xsd file the given schema was built from.
+
+    Args:
+        schema (XMLSchema): The built schema.
+
+    Returns:
+        dict: File digests keyed by file path.
+    """
+    dependencies = {}
+    for sub_schema in schema.maps.iter_schemas():
+        url = sub_schema.url
+        if url is None:
+            continue
+        parsed = urlparse(url)
+        if parsed.scheme not in ('', 'file'):
+            continue
+        path = url2pathname(parsed.path)
+        dependencies[path] = file_digest(path)
+
+    return dependencies
+
+
+def _is_current(dependencies):
+    """Determine whether or not the given dependency digests still match
+    the files on disk.
+
+    Args:
+        dependencies (dict): File digests keyed by file path.
+
+    Returns:
+        bool: True if every file still exists and is unchanged.
+    """
+    for path, digest in dependencies.items():
+        try:
+            if file_digest(path) != digest:
+                return False
+        except OSError:
+            return False
+
+    return True
+
+
+def load(cache_dir, path):
+    """Load the cached schema entry for the xsd file at the given path.
+
+    Args:
+        cache_dir (str): The directory cache entries are stored in.
+        path (str): The xsd file path.
+
+    Returns:
+        dict|None: The entry with the schema and its components, or None if
+            no valid entry exists.
+    """
+    entry_path = os.path.join(cache_dir, get_key(path) + EXT)
+    try:
+        with open(entry_path, 'rb') as entry_file:
+            entry = pickle.load(entry_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError,
+            ImportError):
+        # A broken entry is treated as a miss and overwritten later.
+        return None
+
+    if not _is_current(entry.get(DEPENDENCIES, {})):
+        return None
+
+    return entry
+
+
+def save(cache_dir, path, schema, components):
+    """Save the given schema and its components for the xsd file at the
+    given path.
+
+    Args:
+        cache_dir (str): The directory cache entries are stored in.
+        path (str): The xsd file path.
+        schema (XMLSchema): The built schema.
+        components (mixed): The derived component data to store alongside
+            the schema.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    entry = {
+        DEPENDENCIES: get_dependencies(schema),
+        SCHEMA: schema,
+        COMPONENTS: components,
+    }
+    entry_path = os.path.join(cache_dir, get_key(path) + EXT)
+    handle, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as entry_file:
+            pickle.dump(entry, entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, entry_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
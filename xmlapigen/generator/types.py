@@ -24,18 +24,85 @@ SOFTWARE.
 This module contains doxyparser-specific types which wrap the xmlschema
 types.
 """
-from xmlschema.validators import XsdGroup
-from xmlschema.validators.elements import XsdElement
-from xmlschema.validators.attributes import XsdAttributeGroup, XsdAttribute, XsdAnyAttribute
+import functools
+from xmlschema.names import XSD_NAMESPACE
+from xmlschema.validators.attributes import XsdAnyAttribute
 from xmlschema.validators.simple_types import XsdAtomicBuiltin
-from ..generator import cache
+from .config import FrozenDict
+from .walker import ATTRIBUTES, ELEMENTS, GROUPS, index_component, resolve_enum_values
+
+# Shared, read-only stand-in for child dicts which were never allocated.
+EMPTY = FrozenDict()
+
+# Type wrappers of the builtin xsd types, shared by every schema.
+_builtin_types = {}
+
+
+def memoized(method):
+    """Cache the result of the given argumentless method on its instance.
+
+    The definitions we wrap don't change once the schema is built, so
+    anything derived from them only needs to be computed once.
+
+    Args:
+        method (callable): The method to memoize.
+
+    Returns:
+        callable: The memoized method.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        if self._memo is None:
+            self._memo = {}
+        try:
+            return self._memo[name]
+        except KeyError:
+            value = self._memo[name] = method(self)
+            return value
+
+    return wrapper
+
+
+def get_type_wrapper(definition, cache=None):
+    """Get a Type wrapping the given type definition.
+
+    Builtin xsd types are wrapped once and shared.
+
+    Args:
+        definition (XsdType): The type definition.
+        cache (SchemaCache, optional): The cache of the schema the
+            definition belongs to. Defaults to None.
+
+    Returns:
+        Type: The wrapped type.
+    """
+    if definition.name is None or definition.target_namespace != XSD_NAMESPACE:
+        return Type(definition, cache=cache)
+
+    wrapped = _builtin_types.get(definition.name)
+    if wrapped is None:
+        wrapped = _builtin_types.setdefault(definition.name, Type(definition))
+
+    return wrapped
 
 
 class Super():
     """Super class all types extend from.
     """
-    def __init__(self, definition):
+    __slots__ = ('_definition', '_cache', '_xml')
+
+    def __init__(self, definition, cache=None):
+        """
+        Args:
+            definition (XsdComponent): The xmlschema definition to wrap.
+            cache (SchemaCache, optional): The cache of the schema the
+                definition belongs to. Defaults to None.
+        """
         self._definition = definition
+        self._cache = cache
+        self._xml = None
 
     def get_definition(self):
         """Get the original xmlschema definition type
@@ -46,7 +113,17 @@ class Super():
         return self._definition
 
     def get_xml(self):
-        return self.get_definition().tostring()
+        """Get the xml of the original definition.
+
+        The xml is serialized the first time it is asked for.
+
+        Returns:
+            str: The xml representation of the definition.
+        """
+        if self._xml is None:
+            self._xml = self.get_definition().tostring()
+
+        return self._xml
 
     def get_type_from_cache(self, type_name):
         """Get the type with the given name from our type cache.
@@ -63,19 +140,34 @@ class Super():
         return self.get_cache().get_group(group_name)
 
     def get_cache(self):
-        return cache
+        return self._cache
+
+    def get_children(self):
+        """Get the indexed children of this definition.
+
+        Returns:
+            dict: The definition's ELEMENTS, GROUPS and ATTRIBUTES.
+        """
+        if self.get_cache() is None:
+            return index_component(self.get_definition())
+
+        return self.get_cache().get_children(self.get_definition())
 
 class Typeable(Super):
-    def __init__(self, definition, type_instance=None):
+    __slots__ = ('_type',)
+
+    def __init__(self, definition, type_instance=None, cache=None):
         if type_instance is None:
-            self._type = Type(
-                definition if isinstance(definition, XsdAnyAttribute)
-                else definition.type
-            )
+            if isinstance(definition, XsdAnyAttribute):
+                self._type = Type(definition, cache=cache)
+            elif cache is not None:
+                self._type = cache.get_type_wrapper(definition.type)
+            else:
+                self._type = get_type_wrapper(definition.type)
         else:
             self._type = type_instance
 
-        super().__init__(definition)
+        super().__init__(definition, cache=cache)
 
     def get_type(self):
         return self._type
@@ -117,12 +209,16 @@ class Typeable(Super):
 class Buildable(Super):
     """Provides a class with the ability to build doxyparser-specific data
     relating to XSD attributes, elements and groups.
+
+    Child dicts are only allocated for definitions which have children.
     """
-    def __init__(self, definition):
-        super().__init__(definition)
-        self._attr = {}
-        self._elem = {}
-        self._group = {}
+    __slots__ = ('_attr', '_elem', '_group', '_built')
+
+    def __init__(self, definition, cache=None):
+        super().__init__(definition, cache=cache)
+        self._attr = EMPTY
+        self._elem = EMPTY
+        self._group = EMPTY
         self._built = False
 
     def _build(self):
@@ -130,72 +226,31 @@ class Buildable(Super):
         definition.
         """
         if not self._built:
-            definition = self.get_definition()
-            for component in definition.iter_components():
-                if component == definition:
-                    continue
-                if isinstance(component, XsdAttributeGroup):
-                    continue
-                if isinstance(component, XsdAttribute):
-                    continue
-                if isinstance(component, XsdAnyAttribute):
-                    continue
-                if isinstance(component, XsdGroup):
-                    self._build_group(component)
-                elif isinstance(component, XsdElement):
-                    self._build_element(component)
-                else:
-                    breakpoint()
-                    print(component)
-
-            if hasattr(definition, 'attributes'):
-                for attr_name, attr in definition.attributes.items():
-                    self._attr[attr_name] = Attribute(attr, self)
+            children = self.get_children()
+            if children[GROUPS]:
+                self._group = {
+                    group_name: self.get_group_from_cache(group_name)
+                    for group_name in children[GROUPS]
+                }
+            if children[ELEMENTS]:
+                self._elem = {}
+                for element in children[ELEMENTS].values():
+                    self._build_element(element)
+            if children[ATTRIBUTES]:
+                self._attr = {
+                    attr_name: Attribute(attr, self)
+                    for attr_name, attr in children[ATTRIBUTES].items()
+                }
 
         self._built = True
 
-    def _build_group(self, group):
-        """Iterate through the group's components and add them to this
-        buildable object.
-
-        Args:
-            group (XsdGroup): The group to build
-        Raises:
-            Exception: if we're not currently handline all of the components,
-                make it known.
-        """
-        # This group references a complex type
-        if group.ref is not None:
-            group_ref = self.get_group_from_cache(group.name)
-            self._group[group.name] = group_ref
-        else:
-            for component in group.iter_components():
-                is_group = isinstance(component, XsdGroup)
-                # Iterating the components usually returns the group itself so
-                # we check to make sure our component isn't the group itself.
-                # Also, for groups within groups, we don't want to traverse
-                # deeply because it would mean we going into the elements of
-                # the child group. We just want a reference to the group's
-                # name.
-                if component == group or (is_group and component.ref is None):
-                    continue
-                if is_group:
-                    # self._build_group(component)
-                    # Since we don't want to dive deeper into child groups,
-                    # continue.
-                    continue
-
-                if isinstance(component, XsdElement):
-                    self._build_element(component)
-                else:
-                    # Seems we've encountered a component we haven't prepared
-                    # for. Make it known.
-                    raise Exception(
-                        f'Unhandled component {component} during build process!')
-
     def _build_element(self, element):
-        node_type = self.get_type_from_cache(element.type)
-        self._elem[element.name] = Element(element, node_type)
+        # The element's Type is resolved through our cache.
+        self._elem[element.name] = Element(
+            element,
+            None,
+            cache=self.get_cache()
+        )
 
     def get_attributes(self):
         """Get a list of Attributes associated with this type.
@@ -228,6 +283,12 @@ class Buildable(Super):
         return self._group
 
 class Type(Buildable):
+    __slots__ = ('_memo',)
+
+    def __init__(self, definition, cache=None):
+        super().__init__(definition, cache=cache)
+        self._memo = None
+
     def get_name(self):
         """Get the name of this type.
 
@@ -236,6 +297,7 @@ class Type(Buildable):
         """
         return self.get_definition().name
 
+    @memoized
     def has_content(self):
         """Determine whether or not this type has either nested elements
         or text.
@@ -245,6 +307,7 @@ class Type(Buildable):
         """
         return self.get_definition().content is not None
 
+    @memoized
     def has_empty_content(self):
         """Determine whether or not this type's content is empty.
 
@@ -256,6 +319,7 @@ class Type(Buildable):
         """
         return not self.has_content() or self.get_content().is_empty()
 
+    @memoized
     def is_placeholder(self):
         """Determine whether or not this type is a simple placeholder.
 
@@ -270,6 +334,7 @@ class Type(Buildable):
             and self.has_empty_content()
             and not self.has_attributes())
 
+    @memoized
     def has_attributes(self):
         """Determine whether or not this type has attributes.
 
@@ -286,6 +351,7 @@ class Type(Buildable):
         """
         return self.get_definition().content
 
+    @memoized
     def has_simple_content(self):
         """Determine whether or not this type denys element content but
         allows text content.
@@ -295,6 +361,7 @@ class Type(Buildable):
         """
         return self.has_content() and self.get_definition().has_simple_content()
 
+    @memoized
     def has_complex_content(self):
         """Determine whether or not this type allows element content.
 
@@ -303,6 +370,7 @@ class Type(Buildable):
         """
         return self.has_content() and self.get_definition().has_complex_content()
 
+    @memoized
     def has_element_only_content(self):
         """Determine whether or not this type allows child elements but denys
         intermingled text content.
@@ -313,6 +381,7 @@ class Type(Buildable):
         """
         return self.has_content() and self.get_content().is_element_only()
 
+    @memoized
     def has_mixed_content(self):
         """Determine whether or not this type allows child elements and
         intermingled text.
@@ -323,6 +392,7 @@ class Type(Buildable):
         """
         return self.has_content() and self.get_content().has_mixed_content()
 
+    @memoized
     def is_simple(self):
         """Determine whether or not this type is a simple type.
 
@@ -333,6 +403,7 @@ class Type(Buildable):
         """
         return self.get_definition().is_simple()
 
+    @memoized
     def is_complex(self):
         """Determine whether or not this type is a complex type.
 
@@ -343,15 +414,19 @@ class Type(Buildable):
         """
         return self.get_definition().is_complex()
 
+    @memoized
     def is_empty(self):
         return self.get_definition().is_empty()
 
+    @memoized
     def is_element_only(self):
         return self.get_definition().is_element_only()
 
+    @memoized
     def is_any_type(self):
         return self.get_local_name() == 'anyType'
 
+    @memoized
     def is_text_only(self):
         return self.get_definition().has_simple_content()
 
@@ -364,6 +439,18 @@ class Type(Buildable):
         """
         return self.has_mixed_content()
 
+    def get_enum_values(self):
+        """Get the enum values allowed by this type.
+
+        Returns:
+            list: A list of enum values
+        """
+        if self.get_cache() is None:
+            return resolve_enum_values(self.get_definition())
+
+        return self.get_cache().get_enum_values(self.get_definition())
+
+    @memoized
     def get_local_name(self):
         my_type = self.get_definition()
         local_name = my_type.local_name
@@ -389,28 +476,30 @@ class Type(Buildable):
 
 
 class Element(Typeable):
-    def __init__(self, element, node_type):
-        self._attr = {}
-        super().__init__(element, type_instance=node_type)
+    __slots__ = ('_attr',)
+
+    def __init__(self, element, node_type, cache=None):
+        self._attr = None
+        super().__init__(element, type_instance=node_type, cache=cache)
 
     def get_name(self):
         return self._definition.name
 
     def get_attributes(self):
-        if len(self._attr) == 0:
-            for attr_name, attr in self._definition.attributes.items():
-                self._attr[attr_name] = Attribute(attr, self)
+        if self._attr is None:
+            attributes = self._definition.attributes
+            self._attr = EMPTY if len(attributes) == 0 else {
+                attr_name: Attribute(attr, self)
+                for attr_name, attr in attributes.items()
+            }
 
         return self._attr
 
     def get_attribute_by_name(self, name):
-        return self._attr.get(name, None)
+        return self.get_attributes().get(name, None)
 
 class Group(Buildable):
-    def __init__(self, definition):
-        super().__init__(definition)
-        self._elements = None
-        self._groups = None
+    __slots__ = ()
 
     def get_name(self):
         return self.get_definition().name
@@ -419,11 +508,11 @@ class Attribute(Typeable):
     """Class responsible for holding information relating to xsd schema
     attributes
     """
+    __slots__ = ('_parent',)
 
     def __init__(self, element, parent):
-        self._enums = None
         self._parent = parent
-        super().__init__(element)
+        super().__init__(element, cache=parent.get_cache())
 
     def get_name(self):
         """Get the name of this attribute.
@@ -452,32 +541,10 @@ class Attribute(Typeable):
     def get_enum_values(self):
         """Get the enum values associated with this attribute.
 
-        For types that are union types, we dig deep into them to find whether
-        or not any of their members have enum values.
-
         Returns:
             list: A list of enum values
         """
-
-        if self._enums is None:
-            resolved = None
-            my_type = self.get_definition().type
-            if my_type.is_union():
-                for i in my_type.member_types:
-                    if i.is_restriction():
-                        resolved = i
-                        break
-            elif my_type.is_restriction():
-                resolved = my_type
-
-            if resolved is None:
-                self._enums = []
-            else:
-                if resolved.is_simple():
-                    self._enums = [] if resolved.enumeration is None or resolved.enumeration == [
-                        ''] else resolved.enumeration
-
-        return self._enums
+        return self.get_type().get_enum_values()
 
     def is_required(self):
         """Determine whether or not this attribute is required.
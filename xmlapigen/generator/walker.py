@@ -0,0 +1,149 @@
+"""
+MIT License
+
+Copyright (c) 2020 Collin Brooks
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+This module contains the schema walker which indexes the direct children of
+the components doxyparser builds classes for.
+"""
+from xmlschema.validators import XsdGroup
+from xmlschema.validators.elements import XsdElement
+from xmlschema.validators.attributes import XsdAttributeGroup, XsdAttribute, XsdAnyAttribute
+
+ELEMENTS = 'elements'
+GROUPS = 'groups'
+ATTRIBUTES = 'attributes'
+
+
+def index_component(definition):
+    """Walk the components of the given definition once and index its
+    children.
+
+    Elements nested in the definition's own model groups are children of the
+    definition itself. Referenced groups are indexed by name without walking
+    into them; their elements belong to the group's own index.
+
+    Args:
+        definition (XsdComponent): The type or group to index.
+
+    Raises:
+        Exception: If a component we don't know how to handle is found.
+
+    Returns:
+        dict: The definition's ELEMENTS, GROUPS and ATTRIBUTES, each keyed
+            by name.
+    """
+    elements = {}
+    groups = {}
+    for component in definition.iter_components():
+        if component == definition:
+            continue
+        if isinstance(component, (XsdAttributeGroup, XsdAttribute, XsdAnyAttribute)):
+            continue
+        if isinstance(component, XsdGroup):
+            # Groups defined inline are walked as part of this definition.
+            if component.ref is not None:
+                groups[component.name] = component
+        elif isinstance(component, XsdElement):
+            elements[component.name] = component
+        else:
+            raise Exception(
+                f'Unhandled component {component} in {definition} during '
+                'build process!'
+            )
+
+    attributes = {}
+    if hasattr(definition, 'attributes'):
+        attributes = dict(definition.attributes.items())
+
+    return {ELEMENTS: elements, GROUPS: groups, ATTRIBUTES: attributes}
+
+
+def resolve_enum_values(node_type):
+    """Get the enum values allowed by the given type.
+
+    For types that are union types, we dig deep into them to find whether
+    or not any of their members have enum values.
+
+    Args:
+        node_type (XsdType): The type.
+
+    Returns:
+        list: A list of enum values
+    """
+    resolved = None
+    enums = None
+    if node_type.is_union():
+        for i in node_type.member_types:
+            if i.is_restriction():
+                resolved = i
+                break
+    elif node_type.is_restriction():
+        resolved = node_type
+
+    if resolved is None:
+        enums = []
+    else:
+        if resolved.is_simple():
+            enums = [] if resolved.enumeration is None or resolved.enumeration == [
+                ''] else resolved.enumeration
+
+    return enums
+
+
+def index_enums(index):
+    """Build the enum table of the attribute types in the given index.
+
+    Args:
+        index (dict): The index of each component's children as returned by
+            index_schema().
+
+    Returns:
+        dict: The enum values of each distinct attribute type, keyed by the
+            type.
+    """
+    enums = {}
+    for children in index.values():
+        for attr in children[ATTRIBUTES].values():
+            if isinstance(attr, XsdAnyAttribute) or attr.type in enums:
+                continue
+            enums[attr.type] = resolve_enum_values(attr.type)
+
+    return enums
+
+
+def index_schema(schema):
+    """Index the children of every global group and complex type of the
+    given schema.
+
+    Args:
+        schema (XMLSchema): The schema to index.
+
+    Returns:
+        dict: The index of each component's children, keyed by component.
+    """
+    index = {}
+    for group in schema.groups.values():
+        index[group] = index_component(group)
+    for node_type in schema.complex_types:
+        index[node_type] = index_component(node_type)
+
+    return index
@@ -0,0 +1,141 @@
+"""
+MIT License
+
+Copyright (c) 2020 Collin Brooks
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+from .config_generator import ConfigGenerator, compile_config
+from .element_generator import ElementGenerator
+from .generator.cache import SharedComponents
+from .generator.classdef import STYLE_DECORATORS
+from .generator.pool import map_jobs
+
+
+class Pipeline():
+    """Class responsible for generating configuration and classes for xsd
+    files in a single pass.
+
+    Each xsd is parsed and compiled once; the resulting schema and cache are
+    shared by the configuration and class generation phases.
+    """
+
+    def __init__(self, output, inputs, cache_dir=None, jobs=1, render_jobs=1, incremental=False, config_name='config.yml', sharded=False, style=STYLE_DECORATORS):
+        self._inputs = inputs
+        self._cache_dir = cache_dir
+        self._jobs = jobs
+        self._incremental = incremental
+        self._style = style
+        self._config_generator = ConfigGenerator(
+            output,
+            inputs,
+            cache_dir,
+            config_name=config_name,
+            sharded=sharded
+        )
+
+        output_dir = self._config_generator.get_output_dir()
+        config = self._config_generator.get_config()
+        self._element_generator = ElementGenerator(
+            output_dir,
+            config.get_path(),
+            cache_dir,
+            render_jobs=render_jobs,
+            incremental=incremental,
+            style=style
+        )
+        self._element_generator.set_config(config)
+
+    def generate(self):
+        """Generate the configuration and classes for each of our inputs.
+        """
+        if self._jobs > 1 and len(self._inputs) > 1:
+            self._generate_parallel()
+            return
+
+        # Included xsds are shared between the schemas of this run only.
+        config_generator = self._config_generator
+        config_generator.set_shared_components(SharedComponents())
+        try:
+            for inp in self._inputs:
+                self.generate_xsd(inp)
+        finally:
+            config_generator.set_shared_components(None)
+
+    def generate_xsd(self, xsd):
+        """Generate the configuration and classes for the given xsd.
+
+        Args:
+            xsd (str): The xsd file path.
+        """
+        config_generator = self._config_generator
+        config_generator.generate_xsd(xsd)
+
+        element_generator = self._element_generator
+        element_generator.set_schema(config_generator.get_schema())
+        element_generator.generate_xsd(xsd)
+
+    def _generate_parallel(self):
+        """Generate each xsd in its own worker process and merge the
+        resulting configuration sections into our config.
+        """
+        output_dir = self._config_generator.get_output_dir()
+        # Workers render with the plurals of the existing config, which may
+        # have been adjusted by hand.
+        plurals = dict(self._config_generator.get_config().get_plurals())
+        sections = map_jobs(
+            _generate_xsd,
+            [
+                (output_dir, inp, self._cache_dir, self._incremental, self._style, plurals)
+                for inp in self._inputs
+            ],
+            self._jobs
+        )
+
+        self._config_generator.write_sections(zip(self._inputs, sections))
+
+
+def _generate_xsd(job):
+    """Worker entry point generating the configuration and classes of a
+    single xsd.
+
+    Args:
+        job (tuple): The output directory, the xsd file path, the cache
+            directory, whether or not to generate incrementally, the class
+            style and the plural table of the existing configuration.
+
+    Returns:
+        dict: The xsd's configuration section.
+    """
+    output_dir, xsd, cache_dir, incremental, style, plurals = job
+    schema, config = compile_config(xsd, cache_dir, plurals)
+
+    element_generator = ElementGenerator(
+        output_dir,
+        None,
+        cache_dir,
+        incremental=incremental,
+        style=style
+    )
+    element_generator.set_config(config)
+    element_generator.set_schema(schema)
+    element_generator.generate_xsd(xsd)
+
+    return config.get_xsd_config()
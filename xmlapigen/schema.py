@@ -1,36 +1,131 @@
+from collections.abc import Mapping
 from xmlschema import XMLSchema
-from .element_generator import cache
+from .generator import store
+from .generator.cache import SchemaCache
+
+
+class ElementDefinitions(Mapping):
+    """Read-only mapping of element names to their xml definitions.
+
+    An element's xml is only serialized when it is looked up. Pickling the
+    mapping materializes it into a plain dict so the wrapped elements, and
+    the schema behind them, stay in this process.
+    """
+
+    def __init__(self, elements, names=None):
+        """
+        Args:
+            elements (dict): Elements keyed by name.
+            names (iterable, optional): The names of the elements to expose.
+                Defaults to None, which exposes every element.
+        """
+        if names is not None:
+            elements = {
+                name: elements[name] for name in names if name in elements
+            }
+        self._elements = elements
+
+    def __getitem__(self, name):
+        return self._elements[name].get_xml()
+
+    def __iter__(self):
+        return iter(self._elements)
+
+    def __len__(self):
+        return len(self._elements)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
 
 class Schema():
-    def __init__(self, xmlschema):
-        self._schema = XMLSchema(xmlschema)
+    def __init__(self, xmlschema, cache_dir=None, shared=None):
+        """
+        Args:
+            xmlschema (str): The xsd file path.
+            cache_dir (str, optional): The directory where compiled schemas
+                are persisted. When given, an unchanged xsd is loaded from
+                this directory instead of being parsed and built again.
+                Defaults to None.
+            shared (SharedComponents, optional): The registry wrappers of
+                components declared in included xsds are shared through.
+                Defaults to None.
+        """
+        self._path = xmlschema
+        self._cache_dir = cache_dir
         self._compiled = False
+        self._schema = None
+        self._cache = None
+
+        if cache_dir is not None:
+            entry = store.load(cache_dir, xmlschema)
+            if entry is not None:
+                self._schema = entry[store.SCHEMA]
+                self._cache = entry[store.COMPONENTS]
+                self._compiled = True
+
+        if self._schema is None:
+            self._schema = XMLSchema(xmlschema)
+            self._cache = SchemaCache(self._schema.url, shared)
+
+    def get_cache(self):
+        """Get the cache holding the wrapped components of this schema.
+
+        Returns:
+            SchemaCache: The cache.
+        """
+        return self._cache
 
     def compile(self):
         if not self._compiled:
             self._compile_groups()
             self._compile_types()
             self._compile_elements()
+            self._cache.index(self._schema)
             self._compiled = True
 
+            if self._cache_dir is not None:
+                self._build_components()
+                store.save(
+                    self._cache_dir,
+                    self._path,
+                    self._schema,
+                    self._cache
+                )
+
+    def _build_components(self):
+        """Build the children of every cached component so the derived data
+        is persisted along with the schema.
+        """
+        cache = self._cache
+        for group in cache.get_groups().values():
+            group.get_groups()
+        for node_type in cache.get_types().values():
+            node_type.get_groups()
+            for attr in node_type.get_attributes().values():
+                if not attr.is_any_attribute():
+                    attr.get_enum_values()
+        for element in cache.get_elements().values():
+            element.get_attributes()
+
     def _compile_groups(self):
         """Compile a cache of group data from our schema.
         """
         for group in self._schema.groups.values():
-            cache.add_group(group)
+            self._cache.add_group(group)
 
     def _compile_types(self):
         """Compile a cache of type data from our schema.
         """
         for com in self._schema.complex_types:
-            cache.add_type(com)
+            self._cache.add_type(com)
 
     def _compile_elements(self):
         """Compile a cache of global element data from our schema.
         """
         # Global elements
         for element in self._schema.elements.values():
-            cache.add_element(element)
+            self._cache.add_element(element)
 
     def get_type(self, type_name):
         """Search the schema for the given type.
@@ -44,7 +139,7 @@ class Schema():
         Returns:
             Type: The type.
         """
-        my_type = cache.get_type_or_define(
+        my_type = self._cache.get_type_or_define(
             type_name,
             self._schema.types.get(type_name)
         )
@@ -65,7 +160,7 @@ class Schema():
         Returns:
             Group: The group.
         """
-        my_group = cache.get_group_or_define(
+        my_group = self._cache.get_group_or_define(
             group_name,
             self._schema.groups.get(group_name)
         )
@@ -118,21 +213,39 @@ class Schema():
         """
         return self.get_element(element_name).tostring()
 
-    def get_group_element_definitions(self, group_name):
-        definitions = {}
-        elements = self.get_group(group_name).get_elements().items()
-        for elem_name, elem in elements:
-            definitions[elem_name] = elem.get_xml()
+    def get_group_element_definitions(self, group_name, names=None):
+        """Return the xml definitions of the elements of the given group.
+
+        Args:
+            group_name (str): The group to retrieve element definitions for.
+            names (iterable, optional): Only include these elements.
+                Defaults to None.
+
+        Returns:
+            ElementDefinitions: The lazily serialized definitions keyed by
+                element name.
+        """
+        return ElementDefinitions(
+            self.get_group(group_name).get_elements(),
+            names
+        )
 
-        return definitions
+    def get_type_element_definitions(self, type_name, names=None):
+        """Return the xml definitions of the elements of the given type.
 
-    def get_type_element_definitions(self, type_name):
-        definitions = {}
-        elements = self.get_type(type_name).get_elements().items()
-        for elem_name, elem in elements:
-            definitions[elem_name] = elem.get_xml()
+        Args:
+            type_name (str): The type to retrieve element definitions for.
+            names (iterable, optional): Only include these elements.
+                Defaults to None.
 
-        return definitions
+        Returns:
+            ElementDefinitions: The lazily serialized definitions keyed by
+                element name.
+        """
+        return ElementDefinitions(
+            self.get_type(type_name).get_elements(),
+            names
+        )
 
     def get_group_definition(self, group_name):
         """Return the xml definition of the given group.
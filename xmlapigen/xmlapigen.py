@@ -24,27 +24,85 @@ SOFTWARE.
 
 import os
 import argparse
+from .config_generator import ConfigGenerator
+from .element_generator import ElementGenerator
+from .generator.classdef import STYLE_DECORATORS, STYLES
+from .pipeline import Pipeline
+
+
+def generate_config(args):
+    ConfigGenerator(
+        args.output_dir,
+        args.input,
+        args.cache_dir,
+        args.jobs,
+        args.config_name,
+        args.sharded
+    ).generate()
+
+
+def generate_elements(args):
+    output_dir = os.path.dirname(os.path.abspath(args.config))
+    ElementGenerator(
+        output_dir,
+        args.config,
+        args.cache_dir,
+        args.jobs,
+        args.render_jobs,
+        args.incremental,
+        args.style
+    ).generate()
+
+
+def generate(args):
+    Pipeline(
+        args.output_dir,
+        args.input,
+        args.cache_dir,
+        args.jobs,
+        args.render_jobs,
+        args.incremental,
+        args.config_name,
+        args.sharded,
+        args.style
+    ).generate()
+
 
 if __name__ == "__main__":
   parser = argparse.ArgumentParser(prog='xmlapigen', description="Generate an xml API from xsd files")
+  # Options shared by the sub-commands
+  build_parser = argparse.ArgumentParser(add_help=False)
+  build_parser.add_argument('--cache-dir', help='The directory where compiled schemas are cached between runs')
+  build_parser.add_argument('-j', '--jobs', type=int, default=1, help='The number of xsd files to generate in parallel')
+
+  render_parser = argparse.ArgumentParser(add_help=False)
+  render_parser.add_argument('--render-jobs', type=int, default=1, help='The number of processes rendering the classes of a single xsd')
+  render_parser.add_argument('--incremental', action='store_true', help='Only rewrite classes whose configuration or xsd definition changed')
+  render_parser.add_argument('--style', choices=STYLES, default=STYLE_DECORATORS, help='Generate one decorator per accessor, a single @Schema decorator holding a metadata table, or plain accessor methods and a literal metadata table')
 
   subparsers = parser.add_subparsers(help='sub-command help')
 
-  config_parser = subparsers.add_parser('config', help='Generate configuration')
+  config_parser = subparsers.add_parser('config', parents=[build_parser], help='Generate configuration')
   config_parser.add_argument('output_dir', nargs='?', default='_build', help='The directory where generated output will reside')
   config_parser.add_argument('input', nargs='+', help='One or more xsd files to generate APIs for.')
+  config_parser.add_argument('--config-name', default='config.yml', help='The configuration file name; .json and .msgpack files are stored in those formats')
+  config_parser.add_argument('--sharded', action='store_true', help='Store the configuration of each xsd in its own file')
+  config_parser.set_defaults(func=generate_config)
 
-  element_parser = subparsers.add_parser('elements', help='Generate elements from configuration')
-  element_parser.add_argument('-c', '--config', help="The configuration file to generate elements from")
+  element_parser = subparsers.add_parser('elements', parents=[build_parser, render_parser], help='Generate elements from configuration')
+  element_parser.add_argument('-c', '--config', required=True, help="The configuration file to generate elements from")
+  element_parser.set_defaults(func=generate_elements)
 
-  args = parser.parse_args()
+  generate_parser = subparsers.add_parser('generate', parents=[build_parser, render_parser], help='Generate configuration and elements in a single pass')
+  generate_parser.add_argument('output_dir', nargs='?', default='_build', help='The directory where generated output will reside')
+  generate_parser.add_argument('input', nargs='+', help='One or more xsd files to generate APIs for.')
+  generate_parser.add_argument('--config-name', default='config.yml', help='The configuration file name; .json and .msgpack files are stored in those formats')
+  generate_parser.add_argument('--sharded', action='store_true', help='Store the configuration of each xsd in its own file')
+  generate_parser.set_defaults(func=generate)
 
-  #generator = ElementGenerator(args[1])
-  #operation = args[2]
+  args = parser.parse_args()
 
-  #if operation == 'config':
-  #    generator.generate_config()
-  #elif operation == 'elements':
-  #    generator.generate()
-  #else:
-  #    print('Unknown operation!')
+  if hasattr(args, 'func'):
+    args.func(args)
+  else:
+    parser.print_help()